@@ -1,46 +1,104 @@
 # extractor.py
+import argparse
+import csv
+from collections import Counter
 import fitz  # PyMuPDF
 import re
 import zipfile
 import os
 import shutil
-import pandas as pd
+from operator import itemgetter
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from helpers.extractor import _TABLE_START_RE  # noqa: E402
+
+
+# -----------------------------
+# Precompiled patterns
+# -----------------------------
+_PO_RE = re.compile(r"\bPO\d+\b", re.IGNORECASE)
+_REF_RE = re.compile(r"Your Reference\s+([\w\-\./]*)", re.IGNORECASE)
+_PAY_RE = re.compile(r"Payment Term:\s*(.+)", re.IGNORECASE)
+_DATE_RE = re.compile(r"\b\d{1,2}/\d{1,2}/\d{4}\b")
+_DATE_ANY_RE = re.compile(r"\d{1,2}/\d{1,2}/\d{4}")
+_DATE_PREFIX_RE = re.compile(r"^\d{1,2}/\d{1,2}/\d{2,4}")
+# thousands separator: a comma between two digits. Written comma-first so the
+# regex engine can jump between commas instead of trying every position.
+_NUM_COMMA_RE = re.compile(r',(?<=\d,)(?=\d)')
+_FLOAT_RE = re.compile(r"^\d+\.\d+$")
+_INT_LINE_RE = re.compile(r"^\d+$")
+_INT_RE = re.compile(r"\d+")
+_QTY_UOM_RE = re.compile(r"^(\d+)\s+(\w+)?")
+_NET_RE = re.compile(r"Net\s*\d+", re.IGNORECASE)
+_NET_GROUP_RE = re.compile(r"(Net\s*\d+)", re.IGNORECASE)
+_FLOAT_FIND_RE = re.compile(r"\d+\.\d+")
+_NUM_RE = re.compile(r"[-+]?\d*\.?\d+\Z")
+# used with .match(), so every branch is already anchored at the start
+_IGNORE_RE = re.compile(r"\d+\.\d+\Z|Each\Z|Delivery Date:|Item Code:")
+_TABLE_STOP_RE = re.compile(r"^▌Tax Details", re.MULTILINE)
+# An item block ends at the first line starting with a date after "Delivery Date:"
+_ITEM_END_RE = re.compile(
+    r"^Delivery Date:[^\n]*\n(?:[^\n]*\n)*?\d{1,2}/\d{1,2}/\d{4}[^\n]*$",
+    re.MULTILINE,
+)
+
+# (y0, x0) of a "blocks" tuple. PyMuPDF's own sort=True orders by the
+# bottom edge (y1) instead, which reshuffles multi-line blocks.
+_BLOCK_ORDER = itemgetter(1, 0)
 
 
 # -----------------------------
 # Functions
 # -----------------------------
-def extract_po_info_ILM(pdf_path: str) -> dict:
-    """Extract purchase order header info from a single PDF."""
+def _release_store() -> None:
+    """Empty MuPDF's global resource store so memory stays flat over a large batch."""
     try:
-        doc = fitz.open(pdf_path)
-        full_text = ""
-        for page_num in range(len(doc)):
-            page = doc.load_page(page_num)
-            text_blocks = page.get_text("blocks")
-            # sort by y (top) then x (left) for deterministic ordering
-            text_blocks.sort(key=lambda block: (block[1], block[0]))
-            for block in text_blocks:
-                full_text += (block[4] or "") + "\n"
-        doc.close()
+        fitz.TOOLS.store_shrink(100)
+    except AttributeError:  # older PyMuPDF without TOOLS.store_shrink
+        pass
+
 
+def _load_sorted_text(pdf_path: str) -> str:
+    """Open a PDF once and return the text of all blocks in reading order."""
+    parts = []
+    # read the file in one go and let MuPDF parse it from memory
+    data = Path(pdf_path).read_bytes()
+    try:
+        with fitz.open(stream=data, filetype="pdf") as doc:
+            for page in doc:
+                text_blocks = page.get_text("blocks")
+                # sort by y (top) then x (left) for deterministic ordering
+                text_blocks.sort(key=_BLOCK_ORDER)
+                parts.extend(block[4] or "" for block in text_blocks)
+    finally:
+        _release_store()
+    # keep the trailing newline after the last block, as before
+    parts.append("")
+    return "\n".join(parts)
+
+
+def extract_po_info_ILM(full_text: str) -> dict:
+    """Extract purchase order header info from the text of a single PDF."""
+    try:
         # Document Number (e.g., PO12345)
-        doc_number_match = re.search(r"\bPO\d+\b", full_text, flags=re.IGNORECASE)
+        doc_number_match = _PO_RE.search(full_text)
         document_number = doc_number_match.group(0) if doc_number_match else ""
 
         # Reference
-        reference_match = re.search(r"Your Reference\s+([\w\-\./]*)", full_text, flags=re.IGNORECASE)
+        reference_match = _REF_RE.search(full_text)
         reference = reference_match.group(1).strip() if reference_match else ""
         if reference.lower() == "your":
             reference = ""
 
         # Payment Term
-        payment_match = re.search(r"Payment Term:\s*(.+)", full_text, flags=re.IGNORECASE)
+        payment_match = _PAY_RE.search(full_text)
         payment_term = payment_match.group(1).strip() if payment_match else ""
 
         # Document Date (first occurrence of dd/mm/yyyy)
-        doc_date_match = re.search(r"\b\d{1,2}/\d{1,2}/\d{4}\b", full_text)
+        doc_date_match = _DATE_RE.search(full_text)
         document_date = doc_date_match.group(0) if doc_date_match else ""
 
         return {
@@ -55,65 +113,35 @@ def extract_po_info_ILM(pdf_path: str) -> dict:
 
 
 
-def extract_item_blocks_ILM(pdf_path: str):
-    """Extract item details from PDF table blocks."""
+def extract_item_blocks_ILM(full_text: str, pdf_name: str = ""):
+    """Extract item details from the table blocks of a single PDF's text."""
     try:
-        doc = fitz.open(pdf_path)
-        full_text = ""
-        for page_num in range(len(doc)):
-            page = doc.load_page(page_num)
-            text_blocks = page.get_text("blocks")
-            text_blocks.sort(key=lambda block: (block[1], block[0]))
-            for block in text_blocks:
-                full_text += block[4] + "\n"
-        doc.close()
-
         # Remove commas in numbers (e.g., 1,000 → 1000)
-        full_text = re.sub(r'(?<=\d),(?=\d)', '', full_text)
-        lines = full_text.splitlines()
-        stop_marker = "▌Tax Details"
-
-        inside_table = False
-        blocks = []
-        current_block = []
-        waiting_for_date = False
-        prev_line = ""
-        start_marker_found = False
-
-        for line in lines:
-            line_strip = line.strip()
-
-            if not inside_table:
-                combined = (prev_line + line_strip).replace(" ", "")
-                if combined == "Tax%Tax%":
-                    inside_table = True
-                    prev_line = ""
-                    start_marker_found = True
-                    continue
-                if line_strip == "Tax %":
-                    prev_line = line_strip
-                    continue
-                prev_line = line_strip
-                continue
+        if "," in full_text:
+            full_text = _NUM_COMMA_RE.sub('', full_text)
+        # one stripped line per row so the markers can be matched with ^/$
+        text = "\n".join(line.strip() for line in full_text.splitlines())
 
-            if line_strip.startswith(stop_marker):
-                break
-
-            current_block.append(line)
+        start_match = _TABLE_START_RE.search(text)
+        start_marker_found = start_match is not None
 
-            if line_strip.startswith("Delivery Date:"):
-                waiting_for_date = True
-                continue
-
-            if waiting_for_date:
-                if re.match(r"\d{1,2}/\d{1,2}/\d{4}", line_strip):
-                    current_block.append(line_strip)
-                    blocks.append(parse_block(current_block))
-                    current_block = []
-                    waiting_for_date = False
+        blocks = []
+        if start_marker_found:
+            table = text[start_match.end() + 1:]
+            stop_match = _TABLE_STOP_RE.search(table)
+            if stop_match:
+                table = table[:stop_match.start()]
+
+            pos = 0
+            for m in _ITEM_END_RE.finditer(table):
+                current_block = table[pos:m.end()].split("\n")
+                # the date line is appended a second time, as parse_block expects
+                current_block.append(current_block[-1])
+                blocks.append(parse_block(current_block))
+                pos = m.end() + 1
 
         if not start_marker_found:
-            return {"error": f"❌ '{os.path.basename(pdf_path)}' cannot convert to CSV, maybe format mismatch."}
+            return {"error": f"❌ '{pdf_name}' cannot convert to CSV, maybe format mismatch."}
 
         return blocks
     except Exception as e:
@@ -133,69 +161,62 @@ def parse_block(block_lines: list) -> dict:
         "Total": ""
     }
 
+    # strip every line once up front
+    stripped = [line.strip() for line in block_lines]
+
     # Delivery Date
-    for i, line in enumerate(block_lines):
-        if line.strip().startswith("Delivery Date:") and i + 1 < len(block_lines):
-            data["Delivery Date"] = block_lines[i+1].strip()
+    for i, s in enumerate(stripped):
+        if s.startswith("Delivery Date:") and i + 1 < len(stripped):
+            data["Delivery Date"] = stripped[i+1]
             break
 
     # Item Code
-    for i, line in enumerate(block_lines):
-        if line.strip().startswith("Item Code:") and i + 1 < len(block_lines):
-            data["Item_Code"] = block_lines[i+1].strip()
+    for i, s in enumerate(stripped):
+        if s.startswith("Item Code:") and i + 1 < len(stripped):
+            data["Item_Code"] = stripped[i+1]
             break
 
     # Price & Total
-    float_lines = [line.strip() for line in block_lines if re.match(r"^\d+\.\d+$", line.strip()) and line.strip() != "0.0000"]
-    if float_lines:
-        data["Price"] = float_lines[0]
-        data["Total"] = max(float_lines, key=lambda x: float(x))
+    # (value, text) pairs so each number is converted only once
+    float_pairs = [(float(s), s) for s in stripped if _FLOAT_RE.match(s) and s != "0.0000"]
+    if float_pairs:
+        price_value, data["Price"] = float_pairs[0]
+        total_value, data["Total"] = max(float_pairs, key=itemgetter(0))
 
-    # Quantity
-    try:
-        if data["Price"] and data["Total"]:
-            data["Quantity"] = str(round(float(data["Total"]) / float(data["Price"]), 4))
-    except ZeroDivisionError:
-        data["Quantity"] = ""
+        # Quantity
+        try:
+            data["Quantity"] = str(round(total_value / price_value, 4))
+        except ZeroDivisionError:
+            data["Quantity"] = ""
 
     # Detect UoM
-    for line in block_lines:
-        if line.strip() == "Each":
-            data["UoM(optional)"] = "Each"
-            break
+    if "Each" in stripped:
+        data["UoM(optional)"] = "Each"
 
     # Description & Item Details
-    candidates = []
-    ignore_patterns = [r"^\d+\.\d+$", r"^Each$", r"Delivery Date:", r"Item Code:"]
-    for line in block_lines:
-        line_strip = line.strip()
-        if not any(re.match(p, line_strip) for p in ignore_patterns) and line_strip not in [data["Price"], data["Total"], data["Delivery Date"], data["Item_Code"]]:
-            candidates.append(line_strip)
-
-    seen = {}
+    # Description = lines repeated within the block; Item Details = first
+    # remaining non-numeric line. Both are gathered in a single pass.
+    desc_skip = {data["Price"], data["Total"], data["Delivery Date"], data["Item_Code"]}
+    detail_skip = desc_skip | {data["Quantity"], "Each"}
+    cnt = Counter()
     duplicates = []
-    for line in candidates:
-        if line in seen:
-            duplicates.append(line)
-        else:
-            seen[line] = 1
+    detail_candidates = []
+    for line_strip in stripped:
+        if not _IGNORE_RE.match(line_strip) and line_strip not in desc_skip:
+            cnt[line_strip] += 1
+            if cnt[line_strip] > 1:
+                duplicates.append(line_strip)
+        if line_strip in detail_skip or line_strip.startswith(("Delivery Date:", "Item Code:")):
+            continue
+        detail_candidates.append(line_strip)
 
     data["Description"] = " ".join(duplicates).strip()
 
-    for line in block_lines:
-        line_strip = line.strip()
-        if line_strip in [data["Price"], data["Total"], data["Quantity"], data["Delivery Date"], "Each", data["Item_Code"]]:
+    for line_strip in detail_candidates:
+        if cnt[line_strip] > 1 or _NUM_RE.match(line_strip):
             continue
-        if line_strip.startswith(("Delivery Date:", "Item Code:")):
-            continue
-        if line_strip in duplicates:
-            continue
-        try:
-            float(line_strip)
-            continue
-        except ValueError:
-            data["Item Details"] = line_strip
-            break
+        data["Item Details"] = line_strip
+        break
 
     return data
 
@@ -206,192 +227,258 @@ def parse_block(block_lines: list) -> dict:
 def extract_po_info_Westl(pdf_path: str) -> list:
     rows = []
     try:
-        doc = fitz.open(pdf_path)
-        full_text = ""
-        for page_num in range(len(doc)):
-            page = doc.load_page(page_num)
-            blocks = page.get_text("blocks")
-            blocks.sort(key=lambda b: (b[1], b[0]))
-            for b in blocks:
-                full_text += b[4] + "\n"
-        doc.close()
-
+        full_text = _load_sorted_text(pdf_path)
         lines = [l.strip() for l in full_text.splitlines() if l.strip()]
+        header = extract_header_Westl(full_text, lines)
+        rows = extract_items_Westl(lines, header, os.path.basename(pdf_path))
+    except Exception as e:
+        print(f"❌ Error in {pdf_path}: {e}")
+    return rows
 
-        # -------------------
-        # Document Number
-        # -------------------
-        first_int = re.search(r"\d+", full_text)
-        document_number = f"PO{first_int.group(0)}" if first_int else ""
-
-        # -------------------
-        # Header info
-        # -------------------
-        po_issue_date, payment_term, ship_via, fob = "", "", "", ""
-        for i, line in enumerate(lines):
-            if not po_issue_date and re.search(r"\d{1,2}/\d{1,2}/\d{4}", line):
-                po_issue_date = re.search(r"\d{1,2}/\d{1,2}/\d{4}", line).group(0)
-
-            net_match = re.search(r"(Net\s*\d+)", line, re.IGNORECASE)
-            if net_match:
-                payment_term = net_match.group(1)
-                fob = line[:net_match.start()].strip()
-                if i-1 >= 0:
-                    upper_line = lines[i-1].strip()
-                    if not re.match(r"^\d{1,2}/\d{1,2}/\d{2,4}", upper_line) \
-                       and not re.match(r"^\d+$", upper_line):
-                        ship_via = upper_line
-                break
 
-        # -------------------
-        # Buyer, REQ# and Requisitioner (dynamic logic)
-        # -------------------
-        buyer, req_num, requisitioner = "", "", ""
-        for i, line in enumerate(lines):
-            if line.strip().upper() == "ITEM":
-                # Requisitioner: 1 line above ITEM
-                candidate_req_name = lines[i-1].strip() if i-1 >= 0 else ""
-                if candidate_req_name and not re.match(r"\d{1,2}/\d{1,2}/\d{2,4}", candidate_req_name) \
-                   and not re.match(r"^\d+$", candidate_req_name) \
-                   and not re.search(r"Net\s*\d+", candidate_req_name, re.IGNORECASE):
-                    requisitioner = candidate_req_name
-                else:
-                    requisitioner = ""
-
-                # REQ#: 2 lines above ITEM
-                candidate_req = lines[i-2].strip() if i-2 >= 0 else ""
-                if re.match(r"^\d+$", candidate_req):
-                    req_num = candidate_req
-                else:
-                    req_num = ""
-
-                # Buyer: dynamic based on other fields
-                if requisitioner == "" and req_num == "":
-                    candidate_buyer = lines[i-1].strip() if i-1 >= 0 else ""  # 1 line above
-                elif requisitioner == "":
-                    candidate_buyer = lines[i-2].strip() if i-2 >= 0 else ""  # 2 lines above
-                else:
-                    candidate_buyer = lines[i-3].strip() if i-3 >= 0 else ""  # 3 lines above
-
-                buyer = candidate_buyer if re.match(r"^\d+$", candidate_buyer) else ""
-                break
+def extract_header_Westl(full_text: str, lines: list) -> dict:
+    """Extract the PO header fields from a Westell PO's text."""
+    # -------------------
+    # Document Number
+    # -------------------
+    first_int = _INT_RE.search(full_text)
+    document_number = f"PO{first_int.group(0)}" if first_int else ""
+
+    # -------------------
+    # Header info
+    # -------------------
+    po_issue_date, payment_term, ship_via, fob = "", "", "", ""
+    for i, line in enumerate(lines):
+        if not po_issue_date and _DATE_ANY_RE.search(line):
+            po_issue_date = _DATE_ANY_RE.search(line).group(0)
+
+        net_match = _NET_GROUP_RE.search(line)
+        if net_match:
+            payment_term = net_match.group(1)
+            fob = line[:net_match.start()].strip()
+            if i-1 >= 0:
+                upper_line = lines[i-1].strip()
+                if not _DATE_PREFIX_RE.match(upper_line) \
+                   and not _INT_LINE_RE.match(upper_line):
+                    ship_via = upper_line
+            break
 
-        # -------------------
-        # Parse line-item blocks
-        # -------------------
-        blocks = []
-        in_block_section = False
-        current_block = []
-        skip_header = False
-
-        for i, line in enumerate(lines):
-            if not in_block_section:
-                if i < len(lines)-1 and lines[i] == "Unit Cost" and lines[i+1] == "Extended Cost":
-                    in_block_section = True
-                    skip_header = True
+    # -------------------
+    # Buyer, REQ# and Requisitioner (dynamic logic)
+    # -------------------
+    buyer, req_num, requisitioner = "", "", ""
+    for i, line in enumerate(lines):
+        if line.strip().upper() == "ITEM":
+            # Requisitioner: 1 line above ITEM
+            candidate_req_name = lines[i-1].strip() if i-1 >= 0 else ""
+            if candidate_req_name and not _DATE_PREFIX_RE.match(candidate_req_name) \
+               and not _INT_LINE_RE.match(candidate_req_name) \
+               and not _NET_RE.search(candidate_req_name):
+                requisitioner = candidate_req_name
+            else:
+                requisitioner = ""
+
+            # REQ#: 2 lines above ITEM
+            candidate_req = lines[i-2].strip() if i-2 >= 0 else ""
+            if _INT_LINE_RE.match(candidate_req):
+                req_num = candidate_req
+            else:
+                req_num = ""
+
+            # Buyer: dynamic based on other fields
+            if requisitioner == "" and req_num == "":
+                candidate_buyer = lines[i-1].strip() if i-1 >= 0 else ""  # 1 line above
+            elif requisitioner == "":
+                candidate_buyer = lines[i-2].strip() if i-2 >= 0 else ""  # 2 lines above
+            else:
+                candidate_buyer = lines[i-3].strip() if i-3 >= 0 else ""  # 3 lines above
+
+            buyer = candidate_buyer if _INT_LINE_RE.match(candidate_buyer) else ""
+            break
+
+    return {
+        "Document Number": document_number,
+        "PO_issue Date": po_issue_date,
+        "SHIP VIA": ship_via,
+        "FOB": fob,
+        "Payment Term": payment_term,
+        "BUYER": buyer,
+        "REQ#": req_num,
+        "REQUISITIONER": requisitioner,
+    }
+
+
+def extract_items_Westl(lines: list, header: dict, pdf_name: str = "") -> list:
+    """Extract one row per line item, stamped with the given header fields."""
+    # -------------------
+    # Parse line-item blocks
+    # -------------------
+    rows = []
+    blocks = []
+    in_block_section = False
+    current_block = []
+    skip_header = False
+
+    for i, line in enumerate(lines):
+        if not in_block_section:
+            if i < len(lines)-1 and lines[i] == "Unit Cost" and lines[i+1] == "Extended Cost":
+                in_block_section = True
+                skip_header = True
+            continue
+
+        if skip_header and line == "Extended Cost":
+            skip_header = False
+            continue
+
+        if line.strip().upper() == "TOTAL":
+            if current_block:
+                blocks.append(current_block)
+            break
+
+        if _INT_LINE_RE.match(line):
+            if current_block:
+                blocks.append(current_block)
+                current_block = []
+            current_block.append(line)
+        else:
+            current_block.append(line)
+
+    if not blocks:
+        print(f"⚠️ No rows can be extracted from '{pdf_name}' – no blocks found.")
+        return []
+
+    # -------------------
+    # Extract rows per block
+    # -------------------
+    for blk in blocks:
+        clean_blk = [l.replace(",", "") for l in blk]
+        used_lines = set()
+
+        item_code = clean_blk[0] if clean_blk else ""
+        used_lines.add(item_code)
+
+        qty, uom = "", ""
+        for l in clean_blk:
+            if l in used_lines:
                 continue
+            m = _QTY_UOM_RE.match(l)
+            if m:
+                qty = m.group(1)
+                uom = m.group(2) if m.group(2) else ""
+                used_lines.add(l)
+                break
 
-            if skip_header and line == "Extended Cost":
-                skip_header = False
+        floats = []
+        for l in clean_blk:
+            if l in used_lines:
                 continue
+            floats += _FLOAT_FIND_RE.findall(l)
+        price = floats[0] if floats else ""
+        total = floats[-1] if floats else ""
 
-            if line.strip().upper() == "TOTAL":
-                if current_block:
-                    blocks.append(current_block)
+        delivery_date = ""
+        for l in clean_blk:
+            if l in used_lines:
+                continue
+            date_match = _DATE_ANY_RE.search(l)
+            if date_match:
+                delivery_date = date_match.group(0)
+                used_lines.add(l)
                 break
 
-            if re.match(r"^\d+$", line):
-                if current_block:
-                    blocks.append(current_block)
-                    current_block = []
-                current_block.append(line)
-            else:
-                current_block.append(line)
-
-        if not blocks:
-            print(f"⚠️ No rows can be extracted from '{os.path.basename(pdf_path)}' – no blocks found.")
-            return []
-
-        # -------------------
-        # Extract rows per block
-        # -------------------
-        for blk in blocks:
-            clean_blk = [re.sub(r",", "", l) for l in blk]
-            used_lines = set()
-
-            item_code = clean_blk[0] if clean_blk else ""
-            used_lines.add(item_code)
-
-            qty, uom = "", ""
-            for l in clean_blk:
-                if l in used_lines:
-                    continue
-                m = re.match(r"^(\d+)\s+(\w+)?", l)
-                if m:
-                    qty = m.group(1)
-                    uom = m.group(2) if m.group(2) else ""
-                    used_lines.add(l)
-                    break
-
-            floats = []
-            for l in clean_blk:
-                if l in used_lines:
-                    continue
-                floats += re.findall(r"\d+\.\d+", l)
-            price = floats[0] if floats else ""
-            total = floats[-1] if floats else ""
-
-            delivery_date = ""
-            for l in clean_blk:
-                if l in used_lines:
-                    continue
-                date_match = re.search(r"\d{1,2}/\d{1,2}/\d{4}", l)
-                if date_match:
-                    delivery_date = date_match.group(0)
-                    used_lines.add(l)
-                    break
-
-            desc = ""
-            usd_idx = None
-            for i, l in enumerate(clean_blk):
-                if l in used_lines:
-                    continue
-                if "USD" in l.upper():
-                    usd_idx = i
-                    used_lines.add(l)
-                    break
-            if usd_idx is not None and usd_idx + 1 < len(clean_blk):
-                desc = " ".join(clean_blk[usd_idx+1:]).strip()
-            elif usd_idx is None:
-                desc = " ".join(clean_blk[1:]).strip()
-
-            row = {
-                "Document Number": document_number,
-                "Part/Description": desc,
-                "Item_Code": item_code,
-                "PO_issue Date": po_issue_date,
-                "Delivery Date": delivery_date,
-                "SHIP VIA": ship_via,
-                "FOB": fob,
-                "UoM(optional)": uom,
-                "Quantity": qty,
-                "Price": price,
-                "Total": total,
-                "Payment Term": payment_term,
-                "BUYER": buyer,
-                "REQ#": req_num,
-                "REQUISITIONER": requisitioner
-            }
-            rows.append(row)
-
-    except Exception as e:
-        print(f"❌ Error in {pdf_path}: {e}")
+        desc = ""
+        usd_idx = None
+        for i, l in enumerate(clean_blk):
+            if l in used_lines:
+                continue
+            if "USD" in l.upper():
+                usd_idx = i
+                used_lines.add(l)
+                break
+        if usd_idx is not None and usd_idx + 1 < len(clean_blk):
+            desc = " ".join(clean_blk[usd_idx+1:]).strip()
+        elif usd_idx is None:
+            desc = " ".join(clean_blk[1:]).strip()
+
+        row = {
+            "Document Number": header["Document Number"],
+            "Part/Description": desc,
+            "Item_Code": item_code,
+            "PO_issue Date": header["PO_issue Date"],
+            "Delivery Date": delivery_date,
+            "SHIP VIA": header["SHIP VIA"],
+            "FOB": header["FOB"],
+            "UoM(optional)": uom,
+            "Quantity": qty,
+            "Price": price,
+            "Total": total,
+            "Payment Term": header["Payment Term"],
+            "BUYER": header["BUYER"],
+            "REQ#": header["REQ#"],
+            "REQUISITIONER": header["REQUISITIONER"]
+        }
+        rows.append(row)
     return rows
 
 # -----------------------------
 # Main script
 # -----------------------------
+def process_pdf(pdf_file: str) -> list:
+    """Extract all CSV rows for one PDF (top-level so it can run in a worker process)."""
+    try:
+        full_text = _load_sorted_text(pdf_file)
+    except Exception as e:
+        print(f"❌ Error in {pdf_file}: {e}")
+        return []
+
+    po_info = extract_po_info_ILM(full_text)
+    item_blocks = extract_item_blocks_ILM(full_text, os.path.basename(pdf_file))
+
+    if isinstance(item_blocks, dict) and "error" in item_blocks:
+        print(item_blocks["error"])
+        return []
+    elif not isinstance(item_blocks, list):
+        return []
+
+    # numeric part of the PO number, used by main() to order the output;
+    # DictWriter ignores it because it is not one of the CSV columns
+    document_number = po_info.get("Document Number", "")
+    doc_num_int = int(document_number[2:]) if document_number else -1
+
+    rows = []
+    for block in item_blocks:
+        if not po_info.get("Document Date", ""):
+            continue
+
+        row = {
+            "Document Number": po_info.get("Document Number", ""),
+            "Reference": po_info.get("Reference", ""),
+            "Item_Code": block.get("Item_Code", ""),
+            "PO_issue Date": po_info.get("Document Date", ""),
+            "Delivery Date": block.get("Delivery Date", ""),
+            "Description": block.get("Description", ""),
+            "Item Details": block.get("Item Details", ""),
+            "UoM(optional)": block.get("UoM(optional)", ""),
+            "Quantity": block.get("Quantity", ""),
+            "Price": block.get("Price", ""),
+            "Total": block.get("Total", ""),
+            "Payment Term": po_info.get("Payment Term", ""),
+            "_doc_num_int": doc_num_int,
+        }
+        rows.append(row)
+    return rows
+
+
 def main():
+    parser = argparse.ArgumentParser(description="Extract ILM purchase orders to CSV.")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=min(os.cpu_count() or 1, 6),
+        help="number of worker processes (default: min(cpu_count, 6))",
+    )
+    args = parser.parse_args()
+
     input_pdf_folder = Path("input_pdf_folder")
     output_dir = Path("output")
 
@@ -400,65 +487,41 @@ def main():
         shutil.rmtree(output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    pdf_files = []
-    for root, _, files_in_dir in os.walk(input_pdf_folder):
-        for f in files_in_dir:
-            if f.lower().endswith(".pdf") and not f.startswith("._") and "__MACOSX" not in root:
-                pdf_files.append(os.path.join(root, f))
+    pdf_files = [
+        str(p)
+        for p in input_pdf_folder.rglob("*.[pP][dD][fF]")
+        if not p.name.startswith("._") and "__MACOSX" not in p.parts
+    ]
 
     all_data = []
-    for pdf_file in pdf_files:
-        po_info = extract_po_info(pdf_file)
-        item_blocks = extract_item_blocks(pdf_file)
-
-        if isinstance(item_blocks, dict) and "error" in item_blocks:
-            print(item_blocks["error"])
-            continue
-        elif not isinstance(item_blocks, list):
-            continue
-
-        for block in item_blocks:
-            if not po_info.get("Document Date", ""):
-                continue
-
-            row = {
-                "Document Number": po_info.get("Document Number", ""),
-                "Reference": po_info.get("Reference", ""),
-                "Item_Code": block.get("Item_Code", ""),
-                "PO_issue Date": po_info.get("Document Date", ""),
-                "Delivery Date": block.get("Delivery Date", ""),
-                "Description": block.get("Description", ""),
-                "Item Details": block.get("Item Details", ""),
-                "UoM(optional)": block.get("UoM(optional)", ""),
-                "Quantity": block.get("Quantity", ""),
-                "Price": block.get("Price", ""),
-                "Total": block.get("Total", ""),
-                "Payment Term": po_info.get("Payment Term", "")
-            }
-            all_data.append(row)
+    if args.workers > 1 and len(pdf_files) > 1:
+        with ProcessPoolExecutor(max_workers=args.workers) as ex:
+            for rows in ex.map(process_pdf, pdf_files, chunksize=4):
+                all_data.extend(rows)
+    else:
+        for pdf_file in pdf_files:
+            all_data.extend(process_pdf(pdf_file))
 
     if all_data:
-        df = pd.DataFrame(all_data)
         expected_cols = [
             "Document Number","Reference","Item_Code",
             "PO_issue Date","Delivery Date",
             "Description","Item Details","UoM(optional)",
             "Quantity","Price","Total","Payment Term"
         ]
-        df = df.dropna(subset=["PO_issue Date"])
-        existing_cols = [c for c in expected_cols if c in df.columns]
-        df = df[existing_cols]
-
-        if "Document Number" in df.columns:
-            df["Document Number Sort"] = df["Document Number"].str.extract(r"(\d+)").astype(int)
-            df = df.sort_values(by="Document Number Sort").drop(columns=["Document Number Sort"])
+        # Sort by the numeric part of the Document Number (stable, so rows of
+        # the same PO keep their item order)
+        all_data.sort(key=itemgetter("_doc_num_int"))
 
         out_file = output_dir / "Extracted.csv"
-        df.to_csv(out_file, index=False)
+        with open(out_file, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=expected_cols, extrasaction="ignore", lineterminator="\n")
+            writer.writeheader()
+            writer.writerows(all_data)
         print(f"✅ Extraction complete → {out_file}")
     else:
         print("⚠️ No data extracted.")
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
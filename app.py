@@ -1,3 +1,5 @@
+import hashlib
+import hmac
 import streamlit as st
 
 # Initialize session state for login
@@ -6,26 +8,35 @@ if "logged_in" not in st.session_state:
 if "current_user" not in st.session_state:
     st.session_state["current_user"] = None
 
-# Load user credentials from Streamlit secrets
-USER_CREDENTIALS = {
-    st.secrets["LUKE_LU_USERNAME"]: {
-        "password": st.secrets["LUKE_LU_PASSWORD"],
-        "role": st.secrets["LUKE_LU_ROLE"],
-    },
-    st.secrets["CARTER_DING_USERNAME"]: {
-        "password": st.secrets["CARTER_DING_PASSWORD"],
-        "role": st.secrets["CARTER_DING_ROLE"],
-    },
-    st.secrets["ZACH_LI_USERNAME"]: {
-        "password": st.secrets["ZACH_LI_PASSWORD"],
-        "role": st.secrets["ZACH_LI_ROLE"],
-    },
-}
+def _hash_password(password):
+    return hashlib.sha256(str(password).encode("utf-8")).digest()
+
+# Load user credentials from Streamlit secrets (only password hashes are kept).
+# Cached so the secrets are read and hashed once per process, not on every rerun.
+@st.cache_resource
+def _load_credentials():
+    return {
+        st.secrets["LUKE_LU_USERNAME"]: {
+            "password_hash": _hash_password(st.secrets["LUKE_LU_PASSWORD"]),
+            "role": st.secrets["LUKE_LU_ROLE"],
+        },
+        st.secrets["CARTER_DING_USERNAME"]: {
+            "password_hash": _hash_password(st.secrets["CARTER_DING_PASSWORD"]),
+            "role": st.secrets["CARTER_DING_ROLE"],
+        },
+        st.secrets["ZACH_LI_USERNAME"]: {
+            "password_hash": _hash_password(st.secrets["ZACH_LI_PASSWORD"]),
+            "role": st.secrets["ZACH_LI_ROLE"],
+        },
+    }
+
+USER_CREDENTIALS = _load_credentials()
 
 # Login function
 def login(username, password):
     user = USER_CREDENTIALS.get(username)  # Get user details
-    if user and user["password"] == password:
+    # constant-time comparison of fixed-size digests
+    if user and hmac.compare_digest(user["password_hash"], _hash_password(password)):
         return True
     return False
 
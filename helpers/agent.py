@@ -3,12 +3,15 @@ import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from dataclasses import dataclass
+from typing import Dict, List, Any, Optional, Deque, Tuple
 from openai import OpenAI
 import streamlit as st
 #from config import DEFAULT_MODEL, ADVANCED_MODEL
 from dotenv import load_dotenv
 import os
+import hashlib
+from collections import deque
 
 # Load variables from .env into the environment
 load_dotenv()
@@ -17,6 +20,34 @@ load_dotenv()
 DEFAULT_MODEL = os.getenv("DEFAULT_MODEL","gpt-4o-mini")
 ADVANCED_MODEL = os.getenv("ADVANCED_MODEL","gpt-4o")
 
+# Categorical top values in the LLM context are counted on a sample this size and scaled to the full column,
+# but only for high-cardinality columns: more than CONTEXT_SAMPLE_MIN_UNIQUE distinct values in the first
+# CONTEXT_SAMPLE_ROWS rows. Other columns get exact counts.
+CONTEXT_SAMPLE_ROWS = 50000
+CONTEXT_SAMPLE_MIN_UNIQUE = 10000
+# Number of LLM answers DataAnalysisAgent keeps for repeated questions on the same data
+RESPONSE_CACHE_SIZE = 128
+# (role, content) entries kept in each agent's conversation history
+AGENT_HISTORY_LIMIT = 40
+
+@dataclass
+class DataProfile:
+    """Column partition and LLM context of a DataFrame, shared by the agents for one message"""
+    numeric_cols: List[str]
+    categorical_cols: List[str]
+    shape: Tuple[int, int]
+    context: Optional[str] = None  # Filled in by DataAnalysisAgent when the LLM needs it
+
+
+def build_data_profile(df: pd.DataFrame) -> DataProfile:
+    """Partition df's columns by dtype"""
+    return DataProfile(
+        numeric_cols=df.select_dtypes(include=[np.number]).columns.tolist(),
+        categorical_cols=df.select_dtypes(include=['object']).columns.tolist(),
+        shape=df.shape
+    )
+
+
 class OpenAILLMAgent:
     """Base agent class with OpenAI LLM integration"""
     
@@ -24,7 +55,7 @@ class OpenAILLMAgent:
         self.name = name
         self.role = role
         self.system_prompt = system_prompt
-        self.conversation_history = []
+        self.conversation_history: Deque[Tuple[str, str]] = deque(maxlen=AGENT_HISTORY_LIMIT)
         self.client = None
         
     def initialize_client(self, api_key: str):
@@ -45,18 +76,14 @@ class OpenAILLMAgent:
         
         messages = [
             {"role": "system", "content": self.system_prompt},
-            {"role": "system", "content": f"Data Context: {data_context}"},
-            {"role": "user", "content": user_query}
+            {"role": "system", "content": f"Data Context: {data_context}"}
         ]
         
         # Add recent conversation history for context
-        if self.conversation_history:
-            recent_history = self.conversation_history[-4:]  # Last 4 exchanges
-            for entry in recent_history:
-                if entry.startswith("User:"):
-                    messages.insert(-1, {"role": "user", "content": entry[5:]})
-                elif entry.startswith("Agent:"):
-                    messages.insert(-1, {"role": "assistant", "content": entry[6:]})
+        for role, content in list(self.conversation_history)[-4:]:  # Last 4 exchanges
+            messages.append({"role": role, "content": content})
+        
+        messages.append({"role": "user", "content": user_query})
         
         try:
             response = self.client.chat.completions.create(
@@ -73,27 +100,39 @@ class OpenAILLMAgent:
 class DataAnalysisAgent(OpenAILLMAgent):
     """AutoGen-style agent for data analysis with LLM integration"""
     
-    def analyze_data(self, df: pd.DataFrame, query: str, use_llm: bool = True) -> Dict[str, Any]:
+    def __init__(self, name: str, role: str, system_prompt: str):
+        super().__init__(name, role, system_prompt)
+        # (query, context digest, history digest) -> LLM response, reset whenever the data context changes
+        self._response_cache = {}
+        self._response_context_digest = None
+    
+    def analyze_data(self, df: pd.DataFrame, query: str, use_llm: bool = True,
+                     profile: Optional[DataProfile] = None) -> Dict[str, Any]:
         """Analyze data based on user query with optional LLM enhancement"""
-        self.conversation_history.append(f"User: {query}")
+        self.conversation_history.append(("user", query))
         
         try:
+            if profile is None:
+                profile = build_data_profile(df)
+            
             # Import analysis functions from separate module
             from helpers.data_analysis import DataAnalyzer
             analyzer = DataAnalyzer()
-            basic_result = analyzer.process_query(df, query)
+            basic_result = analyzer.process_query(df, query, profile.numeric_cols, profile.categorical_cols)
             
             if use_llm and self.client:
                 # Enhance with LLM analysis
-                data_context = self._generate_data_context(df)
-                llm_response = self.generate_response(query, data_context)
+                if profile.context is None:
+                    profile.context = self._generate_data_context(df, profile)
+                data_context = profile.context
+                llm_response = self._get_llm_response(query, data_context)
                 
                 # Combine traditional analysis with LLM insights
                 enhanced_response = self._combine_responses(basic_result['response'], llm_response)
                 basic_result['response'] = enhanced_response
                 basic_result['llm_enhanced'] = True
             
-            self.conversation_history.append(f"Agent: {basic_result['response']}")
+            self.conversation_history.append(("assistant", basic_result['response']))
             return basic_result
             
         except Exception as e:
@@ -104,13 +143,36 @@ class DataAnalysisAgent(OpenAILLMAgent):
                 'agent': self.name,
                 'llm_enhanced': False
             }
-            self.conversation_history.append(f"Agent: {error_result['response']}")
+            self.conversation_history.append(("assistant", error_result['response']))
             return error_result
     
-    def _generate_data_context(self, df: pd.DataFrame) -> str:
+    def _get_llm_response(self, query: str, data_context: str) -> str:
+        """
+        Return the LLM answer for query, asking the API only for questions not seen
+        on this data with the same recent conversation (the history slice that
+        generate_response sends along is part of the cache key)
+        """
+        digest = hashlib.blake2b(data_context.encode(), digest_size=8).hexdigest()
+        if digest != self._response_context_digest:
+            # Answers about the previous data can never be hit again
+            self._response_cache.clear()
+            self._response_context_digest = digest
+        history = hashlib.blake2b(repr(list(self.conversation_history)[-4:]).encode(), digest_size=8).hexdigest()
+        key = (query, digest, history)
+        response = self._response_cache.get(key)
+        if response is None:
+            response = self.generate_response(query, data_context)
+            # Errors are not cached so that a retry goes back to the API
+            if response and not response.startswith("❌"):
+                if len(self._response_cache) >= RESPONSE_CACHE_SIZE:
+                    del self._response_cache[next(iter(self._response_cache))]
+                self._response_cache[key] = response
+        return response
+    
+    def _generate_data_context(self, df: pd.DataFrame, profile: DataProfile) -> str:
         """Generate context about the data for LLM"""
-        numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
-        categorical_cols = df.select_dtypes(include=['object']).columns.tolist()
+        numeric_cols = profile.numeric_cols
+        categorical_cols = profile.categorical_cols
         
         context_parts = [
             f"Dataset has {len(df)} rows and {len(df.columns)} columns.",
@@ -122,14 +184,22 @@ class DataAnalysisAgent(OpenAILLMAgent):
         # Add sample statistics
         if numeric_cols:
             for col in numeric_cols[:3]:  # First 3 numeric columns
-                stats = df[col].describe()
+                # Only the three figures used below; describe() would also compute quantiles
+                stats = df[col].agg(['mean', 'min', 'max'])
                 context_parts.append(f"{col}: mean={stats['mean']:.2f}, min={stats['min']:.2f}, max={stats['max']:.2f}")
         
         # Add categorical summaries
         if categorical_cols:
             for col in categorical_cols[:3]:  # First 3 categorical columns
-                value_counts = df[col].value_counts()
-                top_values = value_counts.head(3)
+                values = df[col]
+                if (len(values) > CONTEXT_SAMPLE_ROWS
+                        and values.iloc[:CONTEXT_SAMPLE_ROWS].nunique() > CONTEXT_SAMPLE_MIN_UNIQUE):
+                    # High-cardinality: count on a sample, then scale the counts back up to the full column
+                    scale = len(values) / CONTEXT_SAMPLE_ROWS
+                    top_values = values.sample(n=CONTEXT_SAMPLE_ROWS, random_state=0).value_counts().head(3)
+                    top_values = (top_values * scale).round().astype(top_values.dtype)
+                else:
+                    top_values = values.value_counts().head(3)
                 context_parts.append(f"{col} top values: {dict(top_values)}")
         
         return " | ".join(context_parts)
@@ -146,14 +216,16 @@ class DataAnalysisAgent(OpenAILLMAgent):
 class InsightAgent(OpenAILLMAgent):
     """Agent specialized in generating business insights"""
     
-    def generate_insights(self, df: pd.DataFrame, analysis_result: Dict[str, Any], user_query: str) -> str:
+    def generate_insights(self, df: pd.DataFrame, analysis_result: Dict[str, Any], user_query: str,
+                          profile: Optional[DataProfile] = None) -> str:
         """Generate business insights based on analysis results"""
         if not self.client:
             return "💡 **Business Insight:** LLM not available for advanced insights."
         
+        n_rows, n_cols = profile.shape if profile is not None else df.shape
         data_context = f"""
         Analysis Result: {analysis_result.get('response', 'No analysis available')}
-        Data Summary: {len(df)} records, {len(df.columns)} columns
+        Data Summary: {n_rows} records, {n_cols} columns
         User Query: {user_query}
         """
         
@@ -183,6 +255,8 @@ class AutoGenChatSystem:
         self.conversation_history = []
         self.openai_enabled = False
         self.use_llm_enhancement = True
+        # (df, profile) of the last DataFrame chatted about, shared by all agents
+        self._profile_cache = None
     
     def initialize_openai(self, api_key: str) -> bool:
         """Initialize OpenAI for all agents"""
@@ -194,16 +268,28 @@ class AutoGenChatSystem:
         self.openai_enabled = success
         return success
     
+    def _get_profile(self, df: pd.DataFrame) -> DataProfile:
+        """Return the DataProfile for df, reusing it while the same DataFrame is chatted about"""
+        cache = self._profile_cache
+        if cache is not None and cache[0] is df and cache[1].shape == df.shape:
+            return cache[1]
+        profile = build_data_profile(df)
+        self._profile_cache = (df, profile)
+        return profile
+    
     def process_message(self, df: pd.DataFrame, message: str, generate_insights: bool = False) -> Dict[str, Any]:
         """Process user message through the enhanced agent system"""
+        profile = self._get_profile(df)
+        
         # Primary analysis with data analyst
         agent = self.agents['data_analyst']
-        result = agent.analyze_data(df, message, use_llm=self.openai_enabled and self.use_llm_enhancement)
+        result = agent.analyze_data(df, message, use_llm=self.openai_enabled and self.use_llm_enhancement,
+                                    profile=profile)
         
         # Generate additional insights if requested and LLM is available
         if generate_insights and self.openai_enabled:
             insight_agent = self.agents['insight_analyst']
-            insights = insight_agent.generate_insights(df, result, message)
+            insights = insight_agent.generate_insights(df, result, message, profile=profile)
             if insights and not insights.startswith("❌"):
                 result['insights'] = insights
         
@@ -11,6 +11,7 @@ PAGE_LAYOUT = "wide"
 
 # UI Configuration
 SIDEBAR_STATE = "expanded"
+CHAT_HISTORY_LIMIT = 20  # Only the most recent messages are re-rendered on each rerun
 
 # Agent Configuration
 AGENTS_CONFIG = {
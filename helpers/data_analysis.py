@@ -2,43 +2,65 @@ import pandas as pd
 import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
-from typing import Dict, Any
+import re
+from typing import Dict, Any, List, Optional
+
+
+# Query routes in priority order: (handler name, whole-word keywords)
+_QUERY_ROUTES = (
+    ('count', ('count', 'counts', 'total', 'totals', 'number', 'numbers', r'how\s+many')),
+    ('average', ('average', 'averages', 'mean', 'means', 'avg')),
+    ('sum', ('sum', 'sums')),
+    ('status', ('status', 'statuses', 'pending', 'completed', 'cancelled', 'shipped')),
+    ('customer', ('customer', 'customers', 'client', 'clients')),
+    ('date', ('date', 'dates', 'time', 'times', 'when', 'trend', 'trends')),
+    ('display', ('show', 'display', 'list', 'view')),
+)
+
+# One anchored alternation of lookaheads: the regex engine tries the routes in
+# order and the first one with a keyword anywhere in the (lowercase) query wins,
+# reported through m.lastgroup.
+_QUERY_ROUTE_RE = re.compile(
+    "|".join(
+        rf"(?=.*?(?<![a-z])(?:{'|'.join(words)})(?![a-z]))(?P<{name}>)"
+        for name, words in _QUERY_ROUTES
+    ),
+    re.DOTALL,
+)
 
 
 class DataAnalyzer:
     """Traditional rule-based data analysis methods"""
     
-    def process_query(self, df: pd.DataFrame, query: str) -> Dict[str, Any]:
+    def __init__(self):
+        # Route name (see _QUERY_ROUTES) -> handler
+        self._handlers = {
+            'count': self._handle_count_query,       # Statistical queries
+            'average': self._handle_average_query,
+            'sum': self._handle_sum_query,
+            'status': self._handle_status_query,     # Filtering queries
+            'customer': self._handle_customer_query,
+            'date': self._handle_date_query,
+            'display': self._handle_display_query,
+        }
+    
+    def process_query(self, df: pd.DataFrame, query: str,
+                      numeric_cols: Optional[List[str]] = None,
+                      categorical_cols: Optional[List[str]] = None) -> Dict[str, Any]:
         """Process different types of queries"""
         query_lower = query.lower()
+        # dtype partition is computed once per query (unless the caller already has it)
+        # and shared by the handlers
+        if numeric_cols is None:
+            numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
+        if categorical_cols is None:
+            categorical_cols = df.select_dtypes(include=['object']).columns.tolist()
         
-        # Statistical queries
-        if any(word in query_lower for word in ['count', 'how many', 'total', 'number']):
-            return self._handle_count_query(df, query)
-        
-        elif any(word in query_lower for word in ['average', 'mean', 'avg']):
-            return self._handle_average_query(df, query)
-        
-        elif any(word in query_lower for word in ['sum', 'total value', 'total amount']):
-            return self._handle_sum_query(df, query)
-        
-        # Filtering queries
-        elif any(word in query_lower for word in ['status', 'pending', 'completed', 'cancelled', 'shipped']):
-            return self._handle_status_query(df, query)
-        
-        elif any(word in query_lower for word in ['customer', 'client', 'top customer']):
-            return self._handle_customer_query(df, query)
-        
-        elif any(word in query_lower for word in ['date', 'time', 'when', 'trend']):
-            return self._handle_date_query(df, query)
-        
-        elif any(word in query_lower for word in ['show', 'display', 'list', 'view']):
-            return self._handle_display_query(df, query)
-        
-        else:
-            return self._handle_general_query(df, query)
+        m = _QUERY_ROUTE_RE.match(query_lower)
+        handler = self._handlers[m.lastgroup] if m else self._handle_general_query
+        return handler(df, query, numeric_cols, categorical_cols)
     
-    def _handle_count_query(self, df: pd.DataFrame, query: str) -> Dict[str, Any]:
+    def _handle_count_query(self, df: pd.DataFrame, query: str, numeric_cols: List[str], categorical_cols: List[str]) -> Dict[str, Any]:
         """Handle counting queries"""
         total_records = len(df)
         
@@ -46,7 +68,6 @@ class DataAnalyzer:
             response = f"📊 **Total Orders**: {total_records}"
             
             # Create a simple bar chart if we have categorical columns
-            categorical_cols = df.select_dtypes(include=['object']).columns.tolist()
             if categorical_cols:
                 col = categorical_cols[0]
                 counts = df[col].value_counts().head(10)
@@ -67,10 +88,8 @@ class DataAnalyzer:
             'agent': 'DataAnalyst'
         }
     
-    def _handle_average_query(self, df: pd.DataFrame, query: str) -> Dict[str, Any]:
+    def _handle_average_query(self, df: pd.DataFrame, query: str, numeric_cols: List[str], categorical_cols: List[str]) -> Dict[str, Any]:
         """Handle average/mean queries"""
-        numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
-        
         if not numeric_cols:
             return {
                 'response': "❌ No numeric columns found for calculating averages.",
@@ -79,13 +98,10 @@ class DataAnalyzer:
                 'agent': 'DataAnalyst'
             }
         
-        averages = {}
+        # One vectorized pass over all numeric columns
+        averages = dict(df[numeric_cols].mean().items())
         response_parts = ["📊 **Average Values:**"]
-        
-        for col in numeric_cols:
-            avg_val = df[col].mean()
-            averages[col] = avg_val
-            response_parts.append(f"• {col}: {avg_val:.2f}")
+        response_parts.extend(f"• {col}: {avg_val:.2f}" for col, avg_val in averages.items())
         
         # Create visualization
         fig = px.bar(x=list(averages.keys()), y=list(averages.values()),
@@ -99,10 +115,8 @@ class DataAnalyzer:
             'agent': 'DataAnalyst'
         }
     
-    def _handle_sum_query(self, df: pd.DataFrame, query: str) -> Dict[str, Any]:
+    def _handle_sum_query(self, df: pd.DataFrame, query: str, numeric_cols: List[str], categorical_cols: List[str]) -> Dict[str, Any]:
         """Handle sum queries"""
-        numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
-        
         if not numeric_cols:
             return {
                 'response': "❌ No numeric columns found for calculating sums.",
@@ -111,13 +125,10 @@ class DataAnalyzer:
                 'agent': 'DataAnalyst'
             }
         
-        sums = {}
+        # One vectorized pass over all numeric columns
+        sums = dict(df[numeric_cols].sum().items())
         response_parts = ["📊 **Total Values:**"]
-        
-        for col in numeric_cols:
-            sum_val = df[col].sum()
-            sums[col] = sum_val
-            response_parts.append(f"• {col}: {sum_val:,.2f}")
+        response_parts.extend(f"• {col}: {sum_val:,.2f}" for col, sum_val in sums.items())
         
         return {
             'response': "\n".join(response_parts),
@@ -126,14 +137,13 @@ class DataAnalyzer:
             'agent': 'DataAnalyst'
         }
     
-    def _handle_status_query(self, df: pd.DataFrame, query: str) -> Dict[str, Any]:
+    def _handle_status_query(self, df: pd.DataFrame, query: str, numeric_cols: List[str], categorical_cols: List[str]) -> Dict[str, Any]:
         """Handle status-related queries"""
         # Find status-like columns
         status_cols = [col for col in df.columns if 'status' in col.lower() or 'state' in col.lower()]
         
         if not status_cols:
             # Try to find other categorical columns
-            categorical_cols = df.select_dtypes(include=['object']).columns.tolist()
             if categorical_cols:
                 status_cols = [categorical_cols[0]]
             else:
@@ -163,7 +173,7 @@ class DataAnalyzer:
             'agent': 'DataAnalyst'
         }
     
-    def _handle_customer_query(self, df: pd.DataFrame, query: str) -> Dict[str, Any]:
+    def _handle_customer_query(self, df: pd.DataFrame, query: str, numeric_cols: List[str], categorical_cols: List[str]) -> Dict[str, Any]:
         """Handle customer-related queries"""
         # Find customer-like columns
         customer_cols = [col for col in df.columns 
@@ -196,7 +206,7 @@ class DataAnalyzer:
             'agent': 'DataAnalyst'
         }
     
-    def _handle_date_query(self, df: pd.DataFrame, query: str) -> Dict[str, Any]:
+    def _handle_date_query(self, df: pd.DataFrame, query: str, numeric_cols: List[str], categorical_cols: List[str]) -> Dict[str, Any]:
         """Handle date/time related queries"""
         # Find date-like columns
         date_cols = []
@@ -215,13 +225,11 @@ class DataAnalyzer:
         date_col = date_cols[0]
         
         try:
-            # Try to convert to datetime
-            df_copy = df.copy()
-            df_copy[date_col] = pd.to_datetime(df_copy[date_col], errors='coerce')
-            df_copy = df_copy.dropna(subset=[date_col])
+            # Try to convert to datetime (only the date column, no DataFrame copy)
+            dates = pd.to_datetime(df[date_col], errors='coerce').dropna()
             
             # Group by date and count
-            date_counts = df_copy.groupby(df_copy[date_col].dt.date).size()
+            date_counts = dates.groupby(dates.dt.date).size()
             
             response = f"📅 **Orders by Date ({date_col}):**\nShowing trend over {len(date_counts)} days"
             
@@ -236,7 +244,7 @@ class DataAnalyzer:
                 'chart': fig,
                 'agent': 'DataAnalyst'
             }
-        except:
+        except (ValueError, TypeError, AttributeError):
             return {
                 'response': f"❌ Could not process date column '{date_col}'. Please check the date format.",
                 'data': None,
@@ -244,7 +252,7 @@ class DataAnalyzer:
                 'agent': 'DataAnalyst'
             }
     
-    def _handle_display_query(self, df: pd.DataFrame, query: str) -> Dict[str, Any]:
+    def _handle_display_query(self, df: pd.DataFrame, query: str, numeric_cols: List[str], categorical_cols: List[str]) -> Dict[str, Any]:
         """Handle display/show queries"""
         if 'sample' in query.lower() or 'example' in query.lower():
             sample_size = min(5, len(df))
@@ -260,13 +268,10 @@ class DataAnalyzer:
                 'show_table': True
             }
         
-        return self._handle_general_query(df, query)
+        return self._handle_general_query(df, query, numeric_cols, categorical_cols)
     
-    def _handle_general_query(self, df: pd.DataFrame, query: str) -> Dict[str, Any]:
+    def _handle_general_query(self, df: pd.DataFrame, query: str, numeric_cols: List[str], categorical_cols: List[str]) -> Dict[str, Any]:
         """Handle general queries and provide overview"""
-        numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
-        categorical_cols = df.select_dtypes(include=['object']).columns.tolist()
-        
         response_parts = [
             f"📊 **Data Overview:**",
             f"• Total Records: {len(df)}",
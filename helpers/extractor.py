@@ -5,11 +5,78 @@ import zipfile
 import os
 import shutil
 import pandas as pd
+from functools import lru_cache
+from operator import itemgetter
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import Optional
+
+# -----------------------------
+# Precompiled patterns
+# -----------------------------
+_PO_RE = re.compile(r"\bPO\d+\b", re.IGNORECASE)
+_REF_RE = re.compile(r"Your Reference\s+([\w\-\./]*)", re.IGNORECASE)
+_PAY_RE = re.compile(r"Payment Term:\s*(.+)", re.IGNORECASE)
+_DOC_DATE_RE = re.compile(r"\b\d{1,2}/\d{1,2}/\d{4}\b")
+_DATE_RE = re.compile(r"\d{1,2}/\d{1,2}/\d{4}")
+# thousands separator: a comma between two digits. Written comma-first so the
+# regex engine can jump between commas instead of trying every position.
+_NUM_COMMA_RE = re.compile(r',(?<=\d,)(?=\d)')
+_FLOAT_FIND_RE = re.compile(r'\d+\.\d+')
+_EACH_WORD_RE = re.compile(r'\bEach\b', re.IGNORECASE)
+_DIGITS_RE = re.compile(r"\d+")
+_NET_RE = re.compile(r"Net\s*\d+", re.IGNORECASE)
+_DATE_PREFIX_RE = re.compile(r"\d{1,2}/\d{1,2}/\d{2,4}")
+_QTY_UOM_RE = re.compile(r"^(\d+)\s+(\w+)?")
+
+# parse_block line classifier; alternatives are tried in order, so the first
+# matching kind wins (m.lastgroup)
+_LINE_KIND_RE = re.compile(
+    r"(?P<delivery>Delivery Date:)"
+    r"|(?P<item_code>Item Code:)"
+    r"|(?P<each>Each\Z)"
+    r"|(?P<float>\d+\.\d+$)"
+    r"|(?P<int>\d+$)"
+    r"|(?P<rev>(?:Rev|REV)\s+\w)"
+)
+
+
+def _spaced(text: str) -> str:
+    """Regex for `text` with any run of spaces allowed between characters."""
+    return " *".join(re.escape(c) for c in text)
+
+
+# Item table start: two consecutive stripped lines that read "Tax%Tax%" once
+# spaces are removed (e.g. 'Tax %' / 'Tax %'). An empty line (or the start of
+# the text) counts as an empty half. Also used by the playground script.
+_TABLE_MARKER = "Tax%Tax%"
+_TABLE_START_RE = re.compile(
+    "|".join(
+        [r"(?:\A|^\n)" + _spaced(_TABLE_MARKER) + "$"]
+        + [
+            "^" + _spaced(_TABLE_MARKER[:k]) + r"\n" + _spaced(_TABLE_MARKER[k:]) + "$"
+            for k in range(1, len(_TABLE_MARKER))
+        ]
+        + ["^" + _spaced(_TABLE_MARKER) + r"\n$"]
+    ),
+    re.MULTILINE,
+)
+
+# (y0, x0) of a "blocks" tuple. get_text(sort=True) orders by the bottom
+# edge (y1) instead, which would reshuffle multi-line blocks.
+_BLOCK_ORDER = itemgetter(1, 0)
+
+# Keys of an extract_po_info_Westl() row, in output column order
+WESTL_COLUMNS = (
+    "Document Number", "Part/Description", "Item_Code", "PO_issue Date", "Delivery Date",
+    "SHIP VIA", "FOB", "UoM(optional)", "Quantity", "Price", "Total",
+    "Payment Term", "BUYER", "REQ#", "REQUISITIONER",
+)
 
 # -----------------------------
 # Helper: clean_description
 # -----------------------------
+@lru_cache(maxsize=4096)  # the same part descriptions recur across items and POs
 def clean_description(desc: str) -> str:
     """
     Trim and remove repeated prefix/suffix patterns.
@@ -20,49 +87,80 @@ def clean_description(desc: str) -> str:
     if not desc:
         return ""
     words = desc.split()
-    # Check for repeated substring (try longer first)
+    if len(words) < 3:  # no room for prefix + middle + suffix
+        return desc
+    lower_words = [w.lower() for w in words]
+    # Check for repeated substring (try longer first); words are compared as
+    # lowercase tokens and only joined once a repeat is found
     for length in range(len(words)//2, 0, -1):
-        start_sub = " ".join(words[:length])
-        end_sub = " ".join(words[-length:])
-        if start_sub.lower() == end_sub.lower():
+        if lower_words[:length] == lower_words[-length:]:
             middle = " ".join(words[length:-length])
-            if re.search(r'\bEach\b', middle, flags=re.IGNORECASE) or re.search(r'\d+\.\d+', middle):
+            if _EACH_WORD_RE.search(middle) or _FLOAT_FIND_RE.search(middle):
+                start_sub = " ".join(words[:length])
+                end_sub = " ".join(words[-length:])
                 return max(start_sub, end_sub, key=len).strip()
     return desc
 
 # -----------------------------
 # Functions
 # -----------------------------
-def extract_po_info_ILM(pdf_path: str) -> dict:
-    """Extract purchase order header info from a single PDF."""
+def _release_store() -> None:
+    """
+    Empty MuPDF's global resource store (fonts, images, ...) once a document's
+    text has been read, so memory stays flat when many PDFs are processed.
+    """
     try:
-        doc = fitz.open(pdf_path)
-        full_text = ""
-        for page_num in range(len(doc)):
-            page = doc.load_page(page_num)
-            text_blocks = page.get_text("blocks")
-            # sort by y (top) then x (left) for deterministic ordering
-            text_blocks.sort(key=lambda block: (block[1], block[0]))
-            for block in text_blocks:
-                full_text += (block[4] or "") + "\n"
-        doc.close()
+        fitz.TOOLS.store_shrink(100)
+    except AttributeError:  # older PyMuPDF without TOOLS.store_shrink
+        pass
+
+
+def load_full_text(pdf_path) -> str:
+    """
+    Open a PDF once and return the text of all its blocks in reading order.
+    `pdf_path` may also be the raw PDF bytes (e.g. an upload already in memory).
+    The result can be passed to both ILM extractors so the file is only parsed once.
+    """
+    parts = []
+    try:
+        if isinstance(pdf_path, (bytes, bytearray)):
+            doc = fitz.open(stream=pdf_path, filetype="pdf")
+        else:
+            doc = fitz.open(pdf_path)
+        with doc:
+            for page in doc:
+                text_blocks = page.get_text("blocks")
+                # sort by y (top) then x (left) for deterministic ordering
+                text_blocks.sort(key=_BLOCK_ORDER)
+                parts.extend(block[4] or "" for block in text_blocks)
+    finally:
+        _release_store()
+    parts.append("")  # every block ends with a newline
+    return "\n".join(parts)
+
+
+def extract_po_info_ILM(pdf_path: str, full_text: Optional[str] = None) -> dict:
+    """Extract purchase order header info from a single PDF (or its preloaded text)."""
+    try:
+        if full_text is None:
+            full_text = load_full_text(pdf_path)
 
         # Document Number (e.g., PO12345)
-        doc_number_match = re.search(r"\bPO\d+\b", full_text, flags=re.IGNORECASE)
+        doc_number_match = _PO_RE.search(full_text)
         document_number = doc_number_match.group(0) if doc_number_match else ""
 
         # Reference
-        reference_match = re.search(r"Your Reference\s+([\w\-\./]*)", full_text, flags=re.IGNORECASE)
+        reference_match = _REF_RE.search(full_text)
         reference = reference_match.group(1).strip() if reference_match else ""
         if reference.lower() == "your":
             reference = ""
 
         # Payment Term
-        payment_match = re.search(r"Payment Term:\s*(.+)", full_text, flags=re.IGNORECASE)
+        payment_match = _PAY_RE.search(full_text)
         payment_term = payment_match.group(1).strip() if payment_match else ""
 
         # Document Date (first occurrence of dd/mm/yyyy)
-        doc_date_match = re.search(r"\b\d{1,2}/\d{1,2}/\d{4}\b", full_text)
+        doc_date_match = _DOC_DATE_RE.search(full_text)
         document_date = doc_date_match.group(0) if doc_date_match else ""
 
         return {
@@ -77,87 +175,86 @@ def extract_po_info_ILM(pdf_path: str) -> dict:
 
 
 
-def extract_item_blocks_ILM(pdf_path: str):    
+def extract_item_blocks_ILM(pdf_path: str, full_text: Optional[str] = None):
     """
     Extract item details from PDF table blocks.
     This looks for a start marker like 'Tax %'/'Tax%Tax%' to identify table area,
     collects blocks until a stop marker, then parses by Delivery Date grouping.
+    Pass `full_text` from load_full_text() to skip re-reading the PDF.
     """
     try:
-        doc = fitz.open(pdf_path)
-        full_text = ""
-        for page_num in range(len(doc)):
-            page = doc.load_page(page_num)
-            text_blocks = page.get_text("blocks")
-            text_blocks.sort(key=lambda block: (block[1], block[0]))
-            for block in text_blocks:
-                full_text += (block[4] or "") + "\n"
-        doc.close()
+        if full_text is None:
+            full_text = load_full_text(pdf_path)
 
         # Normalize numbers (remove thousands separators)
-        full_text = re.sub(r'(?<=\d),(?=\d)', '', full_text)
-        lines = full_text.splitlines()
+        if "," in full_text:
+            full_text = _NUM_COMMA_RE.sub('', full_text)
+        # one stripped line per row so the start marker can be found with a regex
+        text = "\n".join(line.strip() for line in full_text.splitlines())
+        lines = text.split("\n")
+        n = len(lines)
         stop_marker = "▌Tax Details"
 
-        inside_table = False
         blocks = []
         current_block = []
+        block_has_page = False  # a line of current_block mentions 'page'
         waiting_for_date = False
-        prev_line = ""  # carry previous line to detect split 'Tax %' markers
         start_marker_found = False
 
-        for line in lines:
-            line_strip = line.strip()
-
+        i, pos = 0, 0  # next line to scan and its offset in `text`
+        while i < n:
             # --------------------
             # Find start marker (handles 'Tax %' split across lines)
             # --------------------
-            if not inside_table:
-                combined = (prev_line + line_strip).replace(" ", "")
-                if combined == "Tax%Tax%":
-                    inside_table = True
-                    prev_line = ""
-                    start_marker_found = True
-                    continue
-                if line_strip == "Tax %":
-                    prev_line = line_strip
-                    continue
-                prev_line = line_strip
-                continue
+            if lines[i].replace(" ", "") == _TABLE_MARKER:
+                pos += len(lines[i]) + 1
+                i += 1
+            else:
+                m = _TABLE_START_RE.search(text, pos)
+                if not m:
+                    break
+                i += text.count("\n", pos, m.end()) + 1
+                pos = m.end() + 1
+            start_marker_found = True
 
             # --------------------
-            # Stop marker
+            # Walk the table until the stop marker or a page break
             # --------------------
-            if line_strip.startswith(stop_marker):
-                inside_table = False
-                continue
+            while i < n:
+                line_strip = lines[i]
+                i += 1
+                pos += len(line_strip) + 1
 
-            # --------------------
-            # Collect block lines
-            # --------------------
-            current_block.append(line_strip)
-
-            if line_strip.startswith("Delivery Date:"):
-                waiting_for_date = True
-                continue
-
-            if waiting_for_date:
-                # expecting a date like d/m/yyyy or dd/mm/yyyy
-                if re.match(r"\d{1,2}/\d{1,2}/\d{4}", line_strip):
-                    # attach the date line
-                    current_block.append(line_strip)
-                    # If block contains 'page' (page footer/header), skip and reset
-                    if any(re.search(r'page', l, re.IGNORECASE) for l in current_block):
+                # Stop marker
+                if line_strip.startswith(stop_marker):
+                    break
+
+                # Collect block lines
+                current_block.append(line_strip)
+                if not block_has_page and "page" in line_strip.lower():
+                    block_has_page = True
+
+                if line_strip.startswith("Delivery Date:"):
+                    waiting_for_date = True
+                    continue
+
+                if waiting_for_date:
+                    # expecting a date like d/m/yyyy or dd/mm/yyyy
+                    if line_strip[:1].isdecimal() and _DATE_RE.match(line_strip):
+                        # attach the date line
+                        current_block.append(line_strip)
+                        # If block contains 'page' (page footer/header), skip and
+                        # look for the next start marker
+                        if block_has_page:
+                            current_block = []
+                            block_has_page = False
+                            waiting_for_date = False
+                            break
+                        # Otherwise parse this block
+                        data = parse_block(current_block)
+                        blocks.append(data)
                         current_block = []
                         waiting_for_date = False
-                        inside_table = False
-                        prev_line = ""
-                        continue
-                    # Otherwise parse this block
-                    data = parse_block(current_block)
-                    blocks.append(data)
-                    current_block = []
-                    waiting_for_date = False
 
         if not start_marker_found:
             return {"error": f"❌ '{os.path.basename(pdf_path)}' cannot convert to CSV, maybe format mismatch."}
@@ -168,6 +265,100 @@ def extract_item_blocks_ILM(pdf_path: str):
         return {"error": str(e)}
 
 
+def _extract_ilm(pdf) -> tuple:
+    """
+    Read one ILM PDF once and run both extractors on it (worker entry point).
+    `pdf` is a path or a (file name, PDF bytes) pair.
+    """
+    pdf_path, source = pdf if isinstance(pdf, tuple) else (pdf, pdf)
+    try:
+        full_text = load_full_text(source)
+    except Exception as e:
+        return {"error": str(e)}, {"error": str(e)}
+    return extract_po_info_ILM(pdf_path, full_text), extract_item_blocks_ILM(pdf_path, full_text)
+
+
+def extract_po_batch(pdf_paths: list, num_workers: Optional[int] = None) -> list:
+    """
+    Extract (po_info, item_blocks) for many ILM PDFs, in the same order as `pdf_paths`.
+    Items may also be (file name, PDF bytes) pairs for files already in memory.
+    Files are spread over worker processes; each worker has its own MuPDF context,
+    so nothing is shared between documents.
+    """
+    if num_workers is None:
+        num_workers = min(os.cpu_count() or 1, 4)
+    if num_workers <= 1 or len(pdf_paths) <= 1:
+        return [_extract_ilm(p) for p in pdf_paths]
+    with ProcessPoolExecutor(max_workers=num_workers) as ex:
+        return list(ex.map(_extract_ilm, pdf_paths, chunksize=4))
+
+
+def _extract_westl(pdf) -> tuple:
+    """
+    Read one Westell PDF and return its rows as one list per WESTL_COLUMNS
+    entry (worker entry point; columns pickle far smaller than row dicts).
+    `pdf` is a path or a (file name, PDF bytes) pair.
+    """
+    pdf_path, source = pdf if isinstance(pdf, tuple) else (pdf, pdf)
+    try:
+        full_text = load_full_text(source)
+    except Exception as e:
+        print(f"❌ Error in {pdf_path}: {e}")
+        return tuple([] for _ in WESTL_COLUMNS)
+    rows = extract_po_info_Westl(pdf_path, full_text)
+    return tuple([row[col] for row in rows] for col in WESTL_COLUMNS)
+
+
+def extract_westl_batch(pdf_paths: list, num_workers: Optional[int] = None) -> dict:
+    """
+    Extract the rows of many Westell PDFs, in the same order as `pdf_paths`,
+    as a dict of column lists keyed by WESTL_COLUMNS (ready for pd.DataFrame).
+    Items may also be (file name, PDF bytes) pairs.
+    """
+    if num_workers is None:
+        num_workers = min(os.cpu_count() or 1, 4)
+    if num_workers <= 1 or len(pdf_paths) <= 1:
+        return _merge_columns(_extract_westl(p) for p in pdf_paths)
+    with ProcessPoolExecutor(max_workers=num_workers) as ex:
+        return _merge_columns(ex.map(_extract_westl, pdf_paths, chunksize=1))
+
+
+def _merge_columns(parts) -> dict:
+    """Concatenate per-file column lists from _extract_westl into one dict."""
+    columns = {col: [] for col in WESTL_COLUMNS}
+    lists = list(columns.values())
+    for part in parts:
+        for dest, values in zip(lists, part):
+            dest.extend(values)
+    return columns
+
+
+def _is_wanted_pdf(path: str) -> bool:
+    """PDF files, skipping macOS resource forks ('._x.pdf', '__MACOSX/')."""
+    name = os.path.basename(path)
+    return name.lower().endswith(".pdf") and not name.startswith("._") and "__MACOSX" not in os.path.dirname(path)
+
+
+def read_pdf_uploads(uploaded_files) -> list:
+    """
+    Read uploaded PDFs and the PDFs inside uploaded ZIPs into memory, once each.
+    Returns (file name, PDF bytes) pairs, ready for extract_po_batch(). A later
+    file with the same path replaces an earlier one, as extracting over it would.
+    """
+    pdf_data = {}  # relative path -> (file name, PDF bytes)
+    for uploaded_file in uploaded_files:
+        if uploaded_file.name.lower().endswith(".zip"):
+            with zipfile.ZipFile(uploaded_file) as zip_ref:
+                for info in zip_ref.infolist():
+                    if info.is_dir() or not _is_wanted_pdf(info.filename):
+                        continue
+                    with zip_ref.open(info) as fh:
+                        pdf_data[info.filename] = (os.path.basename(info.filename), fh.read())
+        elif _is_wanted_pdf(uploaded_file.name):
+            pdf_data[uploaded_file.name] = (uploaded_file.name, uploaded_file.getvalue())
+    return list(pdf_data.values())
+
+
 # -----------------------------
 # Parse one item block
 # -----------------------------
@@ -186,70 +377,68 @@ def parse_block(block_lines: list) -> dict:
         "Total": ""
     }
 
-    # Delivery Date (line after 'Delivery Date:')
-    for i, line in enumerate(block_lines):
-        if line.startswith("Delivery Date:") and i + 1 < len(block_lines):
-            data["Delivery Date"] = block_lines[i+1].strip()
-            break
-
-    # Item Code (line after 'Item Code:')
+    # Classify every line in a single pass
+    n = len(block_lines)
+    delivery_found = False
     item_code_index = -1
-    for i, line in enumerate(block_lines):
-        if line.startswith("Item Code:") and i + 1 < len(block_lines):
-            data["Item_Code"] = block_lines[i+1].strip()
-            item_code_index = i + 1
-            break
-
-    # Price & Total: find float-like lines (e.g., 123.45), exclude "0.0000"
-    float_lines = [ln for ln in block_lines if re.match(r"^\d+\.\d+$", ln) and ln != "0.0000"]
-    if float_lines:
-        data["Price"] = float_lines[0]
-        # Total is the maximum numeric value
-        try:
-            data["Total"] = max(float_lines, key=lambda x: float(x))
-        except Exception:
-            data["Total"] = float_lines[-1]
-
-    # Quantity calculation
-    try:
-        if data["Price"] and data["Total"]:
-            qty = float(data["Total"]) / float(data["Price"])
-            data["Quantity"] = str(round(qty, 4))
-    except Exception:
-        data["Quantity"] = ""
-
-    # Detect UoM
-    for ln in block_lines:
-        if ln == "Each":
-            data["UoM(optional)"] = "Each"
-            break
-
-    # Item Details: look for lines starting with Rev/REV
     rev_index = -1
+    int_index = -1       # nearest integer-only line (like an index) before the item code
+    last_int_index = -1
+    # Price is the first float-like line (e.g., 123.45), Total the largest
+    # (first one on ties); "0.0000" lines are ignored
+    price_val = total_val = None
     for i, ln in enumerate(block_lines):
-        if re.match(r"^(Rev|REV)\s+\w+", ln):
+        m = _LINE_KIND_RE.match(ln)
+        if m is None:
+            continue
+        kind = m.lastgroup
+        if kind == "delivery":
+            # Delivery Date (line after 'Delivery Date:')
+            if not delivery_found and i + 1 < n:
+                data["Delivery Date"] = block_lines[i+1].strip()
+                delivery_found = True
+        elif kind == "item_code":
+            # Item Code (line after 'Item Code:')
+            if item_code_index == -1 and i + 1 < n:
+                data["Item_Code"] = block_lines[i+1].strip()
+                item_code_index = i + 1
+                int_index = last_int_index
+        elif kind == "each":
+            data["UoM(optional)"] = "Each"
+        elif kind == "float":
+            if ln != "0.0000":
+                val = float(ln)
+                if price_val is None:
+                    price_val = total_val = val
+                    data["Price"] = data["Total"] = ln
+                elif val > total_val:
+                    total_val = val
+                    data["Total"] = ln
+        elif kind == "int":
+            last_int_index = i
+        elif rev_index == -1:
+            # Item Details: first line starting with Rev/REV
             data["Item Details"] = ln
             rev_index = i
-            break
+
+    # Quantity from the Price & Total found above
+    if price_val is not None:
+        try:
+            data["Quantity"] = str(round(total_val / price_val, 4))
+        except ZeroDivisionError:
+            data["Quantity"] = ""
 
     # Description: try to locate slice between detected indices
     if item_code_index != -1:
         if rev_index != -1:
             desc_lines = block_lines[rev_index+1:item_code_index]
+        elif int_index != -1:
+            desc_lines = block_lines[int_index+1:item_code_index]
         else:
-            # find nearest integer-only line before item_code_index (like an index)
-            int_index = -1
-            for j in range(item_code_index-1, -1, -1):
-                if re.match(r"^\d+$", block_lines[j].strip()):
-                    int_index = j
-                    break
-            if int_index != -1:
-                desc_lines = block_lines[int_index+1:item_code_index]
-            else:
-                desc_lines = block_lines[:item_code_index]
+            desc_lines = block_lines[:item_code_index]
 
         # Remove 'Item Code:' if present and empty lines
-        desc_lines = [l for l in desc_lines if not l.strip().startswith("Item Code:") and l.strip()]
+        desc_lines = [l for l in desc_lines if l and not l.startswith("Item Code:")]
         combined_desc = " ".join(desc_lines).strip()
         data["Description"] = clean_description(combined_desc)
 
@@ -259,18 +448,15 @@ def parse_block(block_lines: list) -> dict:
 # -----------------------------
 # Function to extract required info
 # -----------------------------
-def extract_po_info_Westl(pdf_path):
+def extract_po_info_Westl(pdf_path, full_text: Optional[str] = None):
+    """
+    Extract one row per line item from a Westell PO.
+    Pass `full_text` from load_full_text() to skip re-reading the PDF.
+    """
     rows = []
     try:
-        doc = fitz.open(pdf_path)
-        full_text = ""
-        for page_num in range(len(doc)):
-            page = doc.load_page(page_num)
-            text_blocks = page.get_text("blocks")
-            text_blocks.sort(key=lambda block: (block[1], block[0]))
-            for block in text_blocks:
-                full_text += block[4] + "\n"
-        doc.close()
+        if full_text is None:
+            full_text = load_full_text(pdf_path)
 
         ##print(full_text)
 
@@ -279,31 +465,30 @@ def extract_po_info_Westl(pdf_path):
         # -------------------
         # Document Number
         # -------------------
-        first_int = None
-        for token in re.findall(r"\d+", full_text):
-            first_int = token
-            break
-        document_number = f"PO{first_int}" if first_int else ""
+        first_int = _DIGITS_RE.search(full_text)
+        document_number = f"PO{first_int.group(0)}" if first_int else ""
 
         # -------------------
         # Header info: PO Issue Date, Payment Term, Ship Via, FOB
         # -------------------
         po_issue_date, payment_term, ship_via, fob = "", "", "", ""
         for i, line in enumerate(lines):
-            if not po_issue_date and re.search(r"\d{1,2}/\d{1,2}/\d{4}", line):
-                po_issue_date = re.search(r"\d{1,2}/\d{1,2}/\d{4}", line).group(0)
+            if not po_issue_date:
+                date_match = _DATE_RE.search(line)
+                if date_match:
+                    po_issue_date = date_match.group(0)
 
-            net_match = re.search(r"(Net\s*\d+)", line, re.IGNORECASE)
+            net_match = _NET_RE.search(line)
             if net_match:
-                payment_term = net_match.group(1)
+                payment_term = net_match.group(0)
                 fob_part = line[:net_match.start()].strip()
                 fob = fob_part if fob_part else ""
 
                 if i-1 >= 0:
-                    upper_line = lines[i-1].strip()
-                    if not re.match(r"^\d{1,2}/\d{1,2}/\d{2,4}", upper_line) \
-                       and not re.match(r"^\d+", upper_line) \
-                       and not re.search(r"Net\s*\d+", upper_line, re.IGNORECASE):
+                    upper_line = lines[i-1]
+                    # (a leading date also starts with a digit)
+                    if not upper_line[:1].isdecimal() \
+                       and not _NET_RE.search(upper_line):
                         ship_via = upper_line
                 break
 
@@ -312,32 +497,32 @@ def extract_po_info_Westl(pdf_path):
         # -------------------
         buyer, req_num, requisitioner = "", "", ""
         for i, line in enumerate(lines):
-            if line.strip().upper() == "ITEM":
+            if line.upper() == "ITEM":
                 # Requisitioner: 1 line above ITEM
-                candidate_req_name = lines[i-1].strip() if i-1 >= 0 else ""
-                if candidate_req_name and not re.match(r"\d{1,2}/\d{1,2}/\d{2,4}", candidate_req_name) \
-                   and not re.match(r"^\d+$", candidate_req_name) \
-                   and not re.search(r"Net\s*\d+", candidate_req_name, re.IGNORECASE):
+                candidate_req_name = lines[i-1] if i-1 >= 0 else ""
+                if candidate_req_name and not _DATE_PREFIX_RE.match(candidate_req_name) \
+                   and not candidate_req_name.isdecimal() \
+                   and not _NET_RE.search(candidate_req_name):
                     requisitioner = candidate_req_name
                 else:
                     requisitioner = ""
 
                 # REQ#: 2 lines above ITEM
-                candidate_req = lines[i-2].strip() if i-2 >= 0 else ""
-                if re.match(r"^\d+$", candidate_req):
+                candidate_req = lines[i-2] if i-2 >= 0 else ""
+                if candidate_req.isdecimal():
                     req_num = candidate_req
                 else:
                     req_num = ""
 
                 # Buyer: dynamic based on other fields
                 if requisitioner == "" and req_num == "":
-                    candidate_buyer = lines[i-1].strip() if i-1 >= 0 else ""  # 1 line above
+                    candidate_buyer = lines[i-1] if i-1 >= 0 else ""  # 1 line above
                 elif requisitioner == "":
-                    candidate_buyer = lines[i-2].strip() if i-2 >= 0 else ""  # 2 lines above
+                    candidate_buyer = lines[i-2] if i-2 >= 0 else ""  # 2 lines above
                 else:
-                    candidate_buyer = lines[i-3].strip() if i-3 >= 0 else ""  # 3 lines above
+                    candidate_buyer = lines[i-3] if i-3 >= 0 else ""  # 3 lines above
 
-                if re.match(r"^\d+$", candidate_buyer):
+                if candidate_buyer.isdecimal():
                     buyer = candidate_buyer
                 else:
                     buyer = ""
@@ -346,34 +531,31 @@ def extract_po_info_Westl(pdf_path):
         # -------------------
         # Parse line-item blocks
         # -------------------
+        # The table starts after a "Unit Cost" line directly followed by
+        # "Extended Cost"; list.index finds the candidates without a Python loop
+        table_start = None
+        try:
+            i = lines.index("Unit Cost")
+            while lines[i+1] != "Extended Cost":
+                i = lines.index("Unit Cost", i + 1)
+            table_start = i + 2
+        except (ValueError, IndexError):  # no header, or "Unit Cost" is the last line
+            pass
+
         blocks = []
-        in_block_section = False
         current_block = []
-        skip_header = False
-
-        for i, line in enumerate(lines):
-            if not in_block_section:
-                if i < len(lines)-1 and lines[i] == "Unit Cost" and lines[i+1] == "Extended Cost":
-                    in_block_section = True
-                    skip_header = True
-                continue
-
-            if skip_header and line == "Extended Cost":
-                skip_header = False
-                continue
-
-            if line.strip().upper() == "TOTAL":
-                if current_block:
-                    blocks.append(current_block)
-                break
+        if table_start is not None:
+            for line in lines[table_start:]:
+                if line.upper() == "TOTAL":
+                    if current_block:
+                        blocks.append(current_block)
+                    break
 
-            if re.match(r"^\d+$", line):
-                if current_block:
+                # an integer-only line (the item code) starts a new block
+                if line.isdecimal() and current_block:
                     blocks.append(current_block)
                     current_block = []
                 current_block.append(line)
-            else:
-                current_block.append(line)
 
         if not blocks:
             print(f"⚠️ No rows can be extracted from '{os.path.basename(pdf_path)}' – no blocks found.")
@@ -383,7 +565,7 @@ def extract_po_info_Westl(pdf_path):
         # Extract rows per block
         # -------------------
         for blk in blocks:
-            clean_blk = [re.sub(r",", "", l) for l in blk]
+            clean_blk = [l.replace(",", "") for l in blk]
             used_lines = set()
 
             item_code = clean_blk[0] if clean_blk else ""
@@ -396,7 +578,7 @@ def extract_po_info_Westl(pdf_path):
             for i, l in enumerate(clean_blk):
                 if l in used_lines:
                     continue
-                m = re.match(r"^(\d+)\s+(\w+)?", l)
+                m = _QTY_UOM_RE.match(l)
                 if m:
                     qty = m.group(1)
                     uom = m.group(2) if m.group(2) else ""
@@ -411,11 +593,8 @@ def extract_po_info_Westl(pdf_path):
                 if between_lines:
                     pre_desc_part = " ".join(between_lines).strip()
 
-            floats = []
-            for l in clean_blk:
-                if l in used_lines:
-                    continue
-                floats += re.findall(r"\d+\.\d+", l)
+            # one findall over the remaining lines (a number never spans a newline)
+            floats = _FLOAT_FIND_RE.findall("\n".join(l for l in clean_blk if l not in used_lines))
             price = floats[0] if floats else ""
             total = floats[-1] if floats else ""
 
@@ -423,7 +602,7 @@ def extract_po_info_Westl(pdf_path):
             for l in clean_blk:
                 if l in used_lines:
                     continue
-                date_match = re.search(r"\d{1,2}/\d{1,2}/\d{4}", l)
+                date_match = _DATE_RE.search(l)
                 if date_match:
                     delivery_date = date_match.group(0)
                     used_lines.add(l)
@@ -1,8 +1,14 @@
 import streamlit as st
+import hashlib
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pa_csv
 from helpers.config import EXAMPLE_QUESTIONS
 
+# Widget keys for the example-question buttons
+_EXAMPLE_KEYS = [f"example_{i}" for i in range(len(EXAMPLE_QUESTIONS))]
+
 
 def apply_custom_css():
     """Apply custom CSS styling to the Streamlit app"""
@@ -148,6 +154,47 @@ def render_llm_settings(chat_system, openai_connected):
     return False
 
 
+def _summarize_df(df: pd.DataFrame) -> tuple:
+    """(rows, columns, numeric columns, text columns, [(column, dtype, unique values)])"""
+    return (
+        len(df),
+        len(df.columns),
+        len(df.select_dtypes(include=[np.number]).columns),
+        len(df.select_dtypes(include=['object']).columns),
+        [(col, str(df[col].dtype), df[col].nunique()) for col in df.columns]
+    )
+
+
+def _load_csv_upload(uploaded_file):
+    """
+    Parse the uploaded CSV and summarize it, once per file content. Reruns with
+    the same file reuse the same DataFrame object (so the agents' per-DataFrame
+    caches keep hitting) and skip the per-column nunique() scans.
+    """
+    digest = hashlib.blake2b(uploaded_file.getvalue(), digest_size=16).digest()
+    cached = st.session_state.get("csv_upload")
+    if cached is None or cached[0] != digest:
+        df = pd.read_csv(uploaded_file)
+        cached = (digest, df, _summarize_df(df))
+        st.session_state.csv_upload = cached
+    return cached[1], cached[2]
+
+
+def dataframe_to_csv_bytes(df: pd.DataFrame) -> bytes:
+    """
+    UTF-8 CSV bytes for a download button, written by Arrow's multithreaded CSV
+    writer (strings are always quoted). Frames Arrow can't convert, e.g. object
+    columns mixing numbers and text, fall back to pandas' writer.
+    """
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return df.to_csv(index=False).encode("utf-8")
+    sink = pa.BufferOutputStream()
+    pa_csv.write_csv(table, sink)
+    return sink.getvalue().to_pybytes()
+
+
 def render_file_upload():
     """Render file upload section and return uploaded dataframe"""
     st.header("📁 Data Source")
@@ -160,27 +207,26 @@ def render_file_upload():
     
     if uploaded_file is not None:
         try:
-            df = pd.read_csv(uploaded_file)
+            df, summary = _load_csv_upload(uploaded_file)
             st.session_state.df = df
+            n_rows, n_cols, n_numeric, n_text, column_details = summary
             
-            st.success(f"✅ Successfully loaded {len(df)} records!")
+            st.success(f"✅ Successfully loaded {n_rows} records!")
             
             # Data overview
             st.subheader("📊 Data Overview")
             st.markdown(f"""
             <div class="stats-container">
-                <strong>Records:</strong> {len(df)}<br>
-                <strong>Columns:</strong> {len(df.columns)}<br>
-                <strong>Numeric Fields:</strong> {len(df.select_dtypes(include=[np.number]).columns)}<br>
-                <strong>Text Fields:</strong> {len(df.select_dtypes(include=['object']).columns)}
+                <strong>Records:</strong> {n_rows}<br>
+                <strong>Columns:</strong> {n_cols}<br>
+                <strong>Numeric Fields:</strong> {n_numeric}<br>
+                <strong>Text Fields:</strong> {n_text}
             </div>
             """, unsafe_allow_html=True)
             
             # Column information
             with st.expander("🔍 Column Details"):
-                for i, col in enumerate(df.columns, 1):
-                    col_type = str(df[col].dtype)
-                    unique_vals = df[col].nunique()
+                for i, (col, col_type, unique_vals) in enumerate(column_details, 1):
                     st.write(f"{i}. **{col}** ({col_type}) - {unique_vals} unique values")
             
             return df
@@ -197,8 +243,8 @@ def render_example_questions():
     st.write('---')
     st.subheader("💡 Example Questions")
     
-    for question in EXAMPLE_QUESTIONS:
-        if st.button(question, key=f"example_{hash(question)}"):
+    for question, key in zip(EXAMPLE_QUESTIONS, _EXAMPLE_KEYS):
+        if st.button(question, key=key):
             if st.session_state.df is not None:
                 st.session_state.messages.append({"role": "user", "content": question})
                 st.rerun()
@@ -226,44 +272,68 @@ def render_system_metrics():
         st.metric("Agent Responses", len([m for m in st.session_state.messages if m['role'] == 'assistant']))
 
 
-def render_chat_message(message):
-    """Render individual chat message"""
+def _message_html(message) -> tuple:
+    """
+    (message HTML, insights HTML or None) for a chat message. Built on first
+    render and kept on the message dict, so reruns skip the formatting.
+    """
+    cached = message.get("_html")
+    if cached is not None:
+        return cached
+
     if message["role"] == "user":
-        st.markdown(f"""
+        html = f"""
         <div class="user-message">
             <strong>👤 You:</strong><br>
             {message["content"]}
         </div>
-        """, unsafe_allow_html=True)
+        """
+        insights_html = None
     else:
         # Determine message class based on LLM enhancement
         message_class = "agent-message llm-enhanced" if message.get('llm_enhanced', False) else "agent-message"
         enhancement_indicator = "🧠 LLM Enhanced" if message.get('llm_enhanced', False) else "📊 Traditional"
-        
-        st.markdown(f"""
+
+        html = f"""
         <div class="{message_class}">
             <strong>🤖 {message.get('agent', 'Assistant')} ({enhancement_indicator}):</strong><br>
             {message["content"]}
         </div>
-        """, unsafe_allow_html=True)
-        
-        # Show chart if available
-        if 'chart' in message and message['chart'] is not None:
-            st.plotly_chart(message['chart'], use_container_width=True)
-        
-        # Show table if available
-        if 'show_table' in message and message['show_table']:
-            if 'data' in message and message['data']:
-                st.dataframe(pd.DataFrame(message['data']), use_container_width=True)
-        
-        # Show insights if available
+        """
+        insights_html = None
         if 'insights' in message and message['insights']:
-            st.markdown(f"""
+            insights_html = f"""
             <div class="insight-box">
                 <strong>💡 Business Insights:</strong><br>
                 {message['insights']}
             </div>
-            """, unsafe_allow_html=True)
+            """
+
+    message["_html"] = (html, insights_html)
+    return message["_html"]
+
+
+def render_chat_message(message):
+    """Render individual chat message"""
+    html, insights_html = _message_html(message)
+    st.markdown(html, unsafe_allow_html=True)
+    if message["role"] == "user":
+        return
+
+    # Show chart if available
+    if 'chart' in message and message['chart'] is not None:
+        st.plotly_chart(message['chart'], use_container_width=True)
+
+    # Show table if available (the DataFrame is built once per message)
+    if 'show_table' in message and message['show_table']:
+        if 'data' in message and message['data']:
+            if "_table" not in message:
+                message["_table"] = pd.DataFrame(message['data'])
+            st.dataframe(message["_table"], use_container_width=True)
+
+    # Show insights if available
+    if insights_html is not None:
+        st.markdown(insights_html, unsafe_allow_html=True)
 
 
 def render_footer():
@@ -5,9 +5,11 @@ Upload STEP files and calculate volumes and weights
 
 import streamlit as st
 import pandas as pd
+import numpy as np
 import tempfile
 import os
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
 from OCP.STEPControl import STEPControl_Reader
 from OCP.IFSelect import IFSelect_ReturnStatus
@@ -17,14 +19,29 @@ from OCP.Bnd import Bnd_Box
 from OCP.BRepBndLib import BRepBndLib
 
 
-def calculate_volume_from_step(step_file_path):
-    """Calculate the volume of a 3D model from a STEP file."""
+# STEP reader reused by every file a pool worker processes (set by _init_step_worker).
+# Stays None in the Streamlit process, whose sessions run on separate threads.
+_worker_reader = None
+
+
+def _init_step_worker():
+    """Pool initializer: build the worker's STEP reader once."""
+    global _worker_reader
+    _worker_reader = STEPControl_Reader()
+
+
+def _load_shape(step_file_path):
+    """Read a STEP file once and return its transferred shape."""
     step_file_path = str(step_file_path)
     
     if not os.path.exists(step_file_path):
         raise FileNotFoundError(f"STEP file not found: {step_file_path}")
     
-    reader = STEPControl_Reader()
+    if _worker_reader is None:
+        reader = STEPControl_Reader()
+    else:
+        reader = _worker_reader
+        reader.ClearShapes()  # drop the previous file's shapes
     status = reader.ReadFile(step_file_path)
     
     if status != IFSelect_ReturnStatus.IFSelect_RetDone:
@@ -36,31 +53,19 @@ def calculate_volume_from_step(step_file_path):
     if shape.IsNull():
         raise ValueError("No valid shape found in STEP file")
     
+    return shape
+
+
+def _volume_from_shape(shape):
+    """Volume of an already loaded shape."""
     props = GProp_GProps()
     BRepGProp.VolumeProperties_s(shape, props)
     
     return props.Mass()
 
 
-def calculate_bounding_box_volume_from_step(step_file_path):
-    """Calculate the bounding box volume (x × y × z) from a STEP file."""
-    step_file_path = str(step_file_path)
-    
-    if not os.path.exists(step_file_path):
-        raise FileNotFoundError(f"STEP file not found: {step_file_path}")
-    
-    reader = STEPControl_Reader()
-    status = reader.ReadFile(step_file_path)
-    
-    if status != IFSelect_ReturnStatus.IFSelect_RetDone:
-        raise ValueError(f"Error reading STEP file: {step_file_path}")
-    
-    reader.TransferRoots()
-    shape = reader.OneShape()
-    
-    if shape.IsNull():
-        raise ValueError("No valid shape found in STEP file")
-    
+def _bbox_from_shape(shape):
+    """Bounding box dimensions and volume (x × y × z) of an already loaded shape."""
     bbox = Bnd_Box()
     BRepBndLib.Add_s(shape, bbox)
     
@@ -80,6 +85,16 @@ def calculate_bounding_box_volume_from_step(step_file_path):
     }
 
 
+def calculate_volume_from_step(step_file_path):
+    """Calculate the volume of a 3D model from a STEP file."""
+    return _volume_from_shape(_load_shape(step_file_path))
+
+
+def calculate_bounding_box_volume_from_step(step_file_path):
+    """Calculate the bounding box volume (x × y × z) from a STEP file."""
+    return _bbox_from_shape(_load_shape(step_file_path))
+
+
 # Common material densities (g/cm³)
 MATERIAL_DENSITIES = {
     'aluminum': 2.70,
@@ -95,81 +110,144 @@ MATERIAL_DENSITIES = {
 }
 
 
+# Metric columns of a processed STEP file, in output order
+STEP_COLUMNS = ('x', 'y', 'z', 'BV/5000', 'SV', 'density', 'SV_weight_kg', 'max_internal_or_weight')
+# Raw values measured per file (mm, mm³, g/cm³); the rest are derived for the whole table at once
+STEP_MEASURED_COLUMNS = ('x', 'y', 'z', 'volume_mm3', 'density')
+
+
+def _compute_step_metrics(step_file_path, material='steel'):
+    """
+    Read a STEP file and measure it; raises on failure.
+    Returns a tuple of floats in STEP_MEASURED_COLUMNS order.
+    """
+    # Parse the STEP file once; volume and bounding box share the shape
+    shape = _load_shape(step_file_path)
+
+    # Actual volume (SV - Solid Volume) in mm³
+    actual_volume_mm3 = _volume_from_shape(shape)
+
+    # Get dimensions
+    bbox_info = _bbox_from_shape(shape)
+    x = bbox_info['x_dimension']
+    y = bbox_info['y_dimension']
+    z = bbox_info['z_dimension']
+
+    # Get material density
+    if isinstance(material, str):
+        density = MATERIAL_DENSITIES.get(material.lower(), MATERIAL_DENSITIES['steel'])
+    else:
+        density = material
+
+    return (x, y, z, actual_volume_mm3, density)
+
+
+def _compute_metrics(vol_mm3, x, y, z, density):
+    """
+    Post-processing of the measured values -> (bv_5000, sv_cm3, weight_kg, max_value).
+    Works element-wise on numpy arrays, so a whole batch is one set of array ops.
+    """
+    # Calculate BV/5000 (internal box volume)
+    bv_5000 = x * y * z / 5000000  # Convert to cm³ and divide by 5000
+
+    sv_cm3 = vol_mm3 / 1000.0  # Convert to cm³
+
+    # Calculate actual weight in kg (SV * density)
+    weight_kg = sv_cm3 * density / 1000.0
+
+    # Calculate max(internal_box_v, actual_weight_kg)
+    max_value = np.maximum(bv_5000, weight_kg)
+
+    return bv_5000, sv_cm3, weight_kg, max_value
+
+
+def step_metrics_frame(values):
+    """Build the STEP_COLUMNS table from an (n files, STEP_MEASURED_COLUMNS) array."""
+    x, y, z, vol_mm3, density = np.asarray(values, dtype=np.float64).reshape(-1, len(STEP_MEASURED_COLUMNS)).T
+    bv_5000, sv_cm3, weight_kg, max_value = _compute_metrics(vol_mm3, x, y, z, density)
+
+    return pd.DataFrame({
+        'x': x,
+        'y': y,
+        'z': z,
+        'BV/5000': bv_5000,
+        'SV': sv_cm3,
+        'density': density,
+        'SV_weight_kg': weight_kg,
+        'max_internal_or_weight': max_value
+    }, columns=list(STEP_COLUMNS))
+
+
 def process_step_file(step_file_path, material='steel'):
     """
     Complete workflow: Read STEP file and calculate volumes.
     Returns a pandas DataFrame with columns: x, y, z, BV/5000, SV, density, max_internal_or_weight
     """
     try:
-        step_file_path = str(step_file_path)
-        
-        # Calculate actual volume (SV - Solid Volume)
-        actual_volume_mm3 = calculate_volume_from_step(step_file_path)
-        sv_cm3 = actual_volume_mm3 / 1000.0  # Convert to cm³
-        
-        # Calculate bounding box volume
-        bbox_info = calculate_bounding_box_volume_from_step(step_file_path)
-        bbox_volume_mm3 = bbox_info['bounding_box_volume']
-        
-        # Get dimensions
-        x = bbox_info['x_dimension']
-        y = bbox_info['y_dimension']
-        z = bbox_info['z_dimension']
-        
-        # Calculate BV/5000 (internal box volume)
-        bv_5000 = bbox_volume_mm3 / 5000000  # Convert to cm³ and divide by 5000
-        
-        # Get material density
-        if isinstance(material, str):
-            density = MATERIAL_DENSITIES.get(material.lower(), MATERIAL_DENSITIES['steel'])
-        else:
-            density = material
-        
-        # Calculate actual weight in kg (SV * density)
-        actual_weight_kg = sv_cm3 * density / 1000.0
-        
-        # Calculate max(internal_box_v, actual_weight_kg)
-        max_value = max(bv_5000, actual_weight_kg)
-        
-        # Create DataFrame
-        df = pd.DataFrame({
-            'x': [x],
-            'y': [y],
-            'z': [z],
-            'BV/5000': [bv_5000],
-            'SV': [sv_cm3],
-            'density': [density],
-            'SV_weight_kg': [actual_weight_kg],
-            'max_internal_or_weight': [max_value]
-        })
-        
-        return df
-    
+        metrics = _compute_step_metrics(step_file_path, material)
     except Exception as e:
         st.error(f"Error processing file: {str(e)}")
         return None
+    return step_metrics_frame([metrics])
+
+
+def _step_job(job):
+    """Worker entry point: (step_file_path, material) -> (metrics tuple or None, error message or None)."""
+    step_file_path, material = job
+    try:
+        return _compute_step_metrics(step_file_path, material), None
+    except Exception as e:
+        return None, str(e)
+
+
+def iter_step_results(jobs, num_workers=None):
+    """
+    Process (step_file_path, material) jobs and yield (index, metrics, error) as each
+    one finishes (see _compute_step_metrics for the metrics tuple). The OpenCascade work is CPU-bound, so files are spread over
+    worker processes; workers never touch Streamlit, errors come back as text.
+    """
+    jobs = list(jobs)
+    if num_workers is None:
+        num_workers = os.cpu_count() or 1
+    if num_workers <= 1 or len(jobs) <= 1:
+        for idx, job in enumerate(jobs):
+            yield (idx, *_step_job(job))
+        return
+    with ProcessPoolExecutor(max_workers=min(num_workers, len(jobs)), initializer=_init_step_worker) as ex:
+        futures = {ex.submit(_step_job, job): idx for idx, job in enumerate(jobs)}
+        for future in as_completed(futures):
+            yield (futures[future], *future.result())
 
 
 def process_multiple_step_files(step_file_paths, material='steel'):
     """Process multiple STEP files and combine results into a single table."""
-    results = []
+    step_file_paths = list(step_file_paths)
+    # one row per file, filled in as results arrive; failed files are masked out
+    values = np.empty((len(step_file_paths), len(STEP_MEASURED_COLUMNS)))
+    ok = np.zeros(len(step_file_paths), dtype=bool)
     
     progress_bar = st.progress(0)
     status_text = st.empty()
     
-    for idx, file_path in enumerate(step_file_paths):
-        status_text.text(f"Processing file {idx + 1}/{len(step_file_paths)}: {Path(file_path).name}")
-        df = process_step_file(file_path, material)
-        if df is not None:
-            df.insert(0, 'filename', Path(file_path).name)
-            results.append(df)
-        progress_bar.progress((idx + 1) / len(step_file_paths))
+    # files are processed in parallel; progress advances as each one finishes
+    jobs = [(file_path, material) for file_path in step_file_paths]
+    for done, (idx, metrics, error) in enumerate(iter_step_results(jobs), 1):
+        name = Path(step_file_paths[idx]).name
+        status_text.text(f"Processed file {done}/{len(step_file_paths)}: {name}")
+        if error is not None:
+            st.error(f"Error processing file: {error}")
+        else:
+            values[idx] = metrics
+            ok[idx] = True
+        progress_bar.progress(done / len(step_file_paths))
     
     status_text.empty()
     progress_bar.empty()
     
-    if results:
-        return pd.concat(results, ignore_index=True)
+    if ok.any():
+        df = step_metrics_frame(values[ok])
+        df.insert(0, 'filename', [Path(p).name for p, good in zip(step_file_paths, ok) if good])
+        return df
     else:
         return pd.DataFrame(columns=['filename', 'x', 'y', 'z', 'BV/5000', 'SV', 'density', 'SV_weight_kg', 'max_internal_or_weight'])
 
@@ -1,10 +1,8 @@
 import streamlit as st
-import tempfile
-import zipfile
 import os
+import hashlib
 import pandas as pd
-from pathlib import Path
-from helpers.extractor import extract_po_info_ILM, extract_item_blocks_ILM
+from helpers.extractor import extract_po_batch, read_pdf_uploads
 
 
 st.set_page_config(page_title="PO PDF Extractor", layout="wide")
@@ -81,69 +79,77 @@ st.markdown(
 # -----------------------------
 # Process uploaded files
 # -----------------------------
+# Output columns, in order
+_ILM_COLUMNS = (
+    "Document Number", "Reference", "Item_Code",
+    "PO_issue Date", "Delivery Date",
+    "Description", "Item Details", "UoM(optional)",
+    "Quantity", "Price", "Total", "Payment Term"
+)
+# (output column, po_info key) for the PO header fields
+_PO_FIELDS = (
+    ("Document Number", "Document Number"),
+    ("Reference", "Reference"),
+    ("PO_issue Date", "Document Date"),
+    ("Payment Term", "Payment Term"),
+)
+# Columns copied from each item block under the same name
+_ITEM_FIELDS = (
+    "Item_Code", "Delivery Date", "Description", "Item Details",
+    "UoM(optional)", "Quantity", "Price", "Total"
+)
+
+
+# Extraction results kept per session, keyed on (file name, content hash)
+_EXTRACT_CACHE_SIZE = 128
+
+
+def _extract_pdfs(pdfs: tuple) -> list:
+    """
+    (po_info, item_blocks) for each (file name, PDF bytes) pair. Results are
+    cached per file content, so Streamlit reruns and repeated uploads only
+    extract files not seen before (in parallel worker processes).
+    """
+    if "ilm_extract_cache" not in st.session_state:
+        st.session_state.ilm_extract_cache = {}
+    cache = st.session_state.ilm_extract_cache
+
+    keys = [(name, hashlib.blake2b(data, digest_size=16).digest()) for name, data in pdfs]
+    missing = [i for i, key in enumerate(keys) if key not in cache]
+    for i, result in zip(missing, extract_po_batch([pdfs[i] for i in missing])):
+        cache[keys[i]] = result
+    results = [cache[key] for key in keys]
+
+    # drop the oldest entries once the cache is full
+    while len(cache) > _EXTRACT_CACHE_SIZE:
+        del cache[next(iter(cache))]
+    return results
+
+
 def process_files(uploaded_files):
-    temp_dir = Path(tempfile.mkdtemp())
-    pdf_dir = temp_dir / "pdf_folder"
-    pdf_dir.mkdir(exist_ok=True)
-
-    for uploaded_file in uploaded_files:
-        file_path = pdf_dir / uploaded_file.name
-        with open(file_path, "wb") as f:
-            f.write(uploaded_file.getbuffer())
-        if uploaded_file.name.lower().endswith(".zip"):
-            with zipfile.ZipFile(file_path, "r") as zip_ref:
-                zip_ref.extractall(pdf_dir)
-            file_path.unlink()
-
-    pdf_files = [
-        os.path.join(root, f)
-        for root, _, files_in_dir in os.walk(pdf_dir)
-        for f in files_in_dir
-        if f.lower().endswith(".pdf") and not f.startswith("._") and "__MACOSX" not in root
-    ]
-
-    all_data = []
-    for pdf_file in pdf_files:
-        po_info = extract_po_info_ILM(pdf_file)
-        item_blocks = extract_item_blocks_ILM(pdf_file)
+    pdfs = tuple(read_pdf_uploads(uploaded_files))
+
+    # One list per output column; PO header fields repeat for every item of the PDF
+    columns = {col: [] for col in _ILM_COLUMNS}
+    for po_info, item_blocks in _extract_pdfs(pdfs):
         if isinstance(item_blocks, dict) and "error" in item_blocks:
             st.warning(item_blocks["error"])
             continue
         if not isinstance(item_blocks, list):
             continue
+        if not po_info.get("Document Date", ""):
+            continue
+
+        n_items = len(item_blocks)
+        for col, key in _PO_FIELDS:
+            columns[col].extend([po_info.get(key, "")] * n_items)
+        for col in _ITEM_FIELDS:
+            columns[col].extend([block.get(col, "") for block in item_blocks])
 
-        for block in item_blocks:
-            if not po_info.get("Document Date", ""):
-                continue
-            row = {
-                "Document Number": po_info.get("Document Number", ""),
-                "Reference": po_info.get("Reference", ""),
-                "Item_Code": block.get("Item_Code", ""),
-                "PO_issue Date": po_info.get("Document Date", ""),
-                "Delivery Date": block.get("Delivery Date", ""),
-                "Description": block.get("Description", ""),
-                "Item Details": block.get("Item Details", ""),
-                "UoM(optional)": block.get("UoM(optional)", ""),
-                "Quantity": block.get("Quantity", ""),
-                "Price": block.get("Price", ""),
-                "Total": block.get("Total", ""),
-                "Payment Term": po_info.get("Payment Term", "")
-            }
-            all_data.append(row)
-
-    if not all_data:
+    if not columns["Document Number"]:
         return pd.DataFrame()
 
-    df = pd.DataFrame(all_data)
-    expected_cols = [
-        "Document Number","Reference","Item_Code",
-        "PO_issue Date","Delivery Date",
-        "Description","Item Details","UoM(optional)",
-        "Quantity","Price","Total","Payment Term"
-    ]
-    df = df.dropna(subset=["PO_issue Date"])
-    df = df[[c for c in expected_cols if c in df.columns]]
-    return df
+    return pd.DataFrame(columns, columns=list(_ILM_COLUMNS))
 
 # -----------------------------
 # Main Streamlit app
@@ -259,10 +265,12 @@ def main():
     # -----------------------------
     # Download selected rows as CSV
     # -----------------------------
-    selected_df = st.session_state.df_display[st.session_state.df_display["Select"]]
+    view = st.session_state.df_display
+    selected = view["Select"].to_numpy(dtype=bool)
 
-    if not selected_df.empty:
-        download_df = selected_df.drop(columns=["Select"])
+    if selected.any():
+        # one positional take of the selected rows, without the Select column
+        download_df = view.iloc[selected, view.columns != "Select"]
         file_data = download_df.to_csv(index=False).encode("utf-8")
         st.download_button(
             label="⬇️ Download Selected Rows as CSV",
@@ -1,10 +1,10 @@
 import streamlit as st
-import tempfile
-import zipfile
-import os
+import hashlib
+from operator import itemgetter
+import numpy as np
 import pandas as pd
-from pathlib import Path
-from helpers.extractor import extract_po_info_Westl
+from helpers.extractor import WESTL_COLUMNS, extract_westl_batch, read_pdf_uploads
+from helpers.ui_components import dataframe_to_csv_bytes
 
 st.set_page_config(page_title="PO PDF Extractor", layout="wide")
 # Check if the user is logged in
@@ -81,49 +81,25 @@ st.markdown(
 # Process uploaded files
 # -----------------------------
 def process_files(uploaded_files):
-    temp_dir = Path(tempfile.mkdtemp())
-    pdf_dir = temp_dir / "pdf_folder"
-    pdf_dir.mkdir(exist_ok=True)
+    # (file name, PDF bytes) for every uploaded PDF; ZIPs are read in memory
+    # and only their PDF members are decompressed, nothing is written to disk
+    pdfs = read_pdf_uploads(uploaded_files)
 
-    for uploaded_file in uploaded_files:
-        file_path = pdf_dir / uploaded_file.name
-        with open(file_path, "wb") as f:
-            f.write(uploaded_file.getbuffer())
-        if uploaded_file.name.lower().endswith(".zip"):
-            with zipfile.ZipFile(file_path, "r") as zip_ref:
-                zip_ref.extractall(pdf_dir)
-            file_path.unlink()
+    # PDFs are parsed in parallel worker processes; results come back as columns
+    columns = extract_westl_batch(pdfs)
 
-    pdf_files = [
-        os.path.join(root, f)
-        for root, _, files_in_dir in os.walk(pdf_dir)
-        for f in files_in_dir
-        if f.lower().endswith(".pdf") and not f.startswith("._") and "__MACOSX" not in root
-    ]
-
-    all_rows = []
-    for pdf_file in pdf_files:
-        all_rows.extend(extract_po_info_Westl(pdf_file))
-
-
-    if all_rows:
-        df = pd.DataFrame(all_rows, columns=[
-        "Document Number", "Part/Description", "Item_Code", "PO_issue Date", "Delivery Date",
-        "SHIP VIA", "FOB", "UoM(optional)", "Quantity", "Price", "Total",
-        "Payment Term", "BUYER", "REQ#", "REQUISITIONER"
-    ])
-
-    # Remove exact duplicate rows
-        df.drop_duplicates(inplace=True)
+    if not columns["Document Number"]:
+        return pd.DataFrame()
 
-    # Sort by Document Number
-        df.sort_values(by="Document Number", inplace=True)
+    # Remove exact duplicate rows (first one wins), then sort by Document Number,
+    # on plain tuples before the frame is built
+    rows = dict.fromkeys(zip(*(columns[col] for col in WESTL_COLUMNS)))
+    rows = sorted(rows, key=itemgetter(0))
 
-        df.to_csv("po_extracted.csv", index=False)
-        print("✅ Extraction complete. Saved to po_extracted.csv")
+    df = pd.DataFrame(rows, columns=list(WESTL_COLUMNS))
 
-    if not all_rows:
-        return pd.DataFrame()
+    df.to_csv("po_extracted.csv", index=False)
+    print("✅ Extraction complete. Saved to po_extracted.csv")
 
     return df
 
@@ -154,8 +130,12 @@ def main():
         st.session_state.uploaded_files = []
     if "df" not in st.session_state:
         st.session_state.df = pd.DataFrame()
-    if "df_display" not in st.session_state:
-        st.session_state.df_display = pd.DataFrame()
+    if "westell_selected" not in st.session_state:
+        st.session_state.westell_selected = np.ones(0, dtype=bool)
+    if "westell_sort_idx" not in st.session_state:
+        st.session_state.westell_sort_idx = {}
+    if "westell_search_cols" not in st.session_state:
+        st.session_state.westell_search_cols = {}
 
     uploaded_files = st.file_uploader(
         "Upload PDF(s) or ZIP containing PDFs",
@@ -165,15 +145,25 @@ def main():
 
     if uploaded_files:
         st.session_state.uploaded_files = list(uploaded_files)
-        st.session_state.df = process_files(st.session_state.uploaded_files)
-
-        if not st.session_state.df.empty:
-            st.session_state.df_display = st.session_state.df.copy()
-            st.session_state.df_display.insert(0, "Select", True)
+        # only re-extract when the uploaded files change, not on every rerun
+        upload_key = tuple(
+            (f.name, hashlib.blake2b(f.getvalue(), digest_size=16).digest())
+            for f in st.session_state.uploaded_files
+        )
+        if st.session_state.get("westell_upload_key") != upload_key:
+            st.session_state.df = process_files(st.session_state.uploaded_files)
+            st.session_state.westell_upload_key = upload_key
+            # every row starts selected
+            st.session_state.westell_selected = np.ones(len(st.session_state.df), dtype=bool)
+            st.session_state.westell_sort_idx = {}
+            st.session_state.westell_search_cols = {}
     else:
         st.session_state.uploaded_files = []
+        st.session_state.westell_upload_key = None
         st.session_state.df = pd.DataFrame()
-        st.session_state.df_display = pd.DataFrame()
+        st.session_state.westell_selected = np.ones(0, dtype=bool)
+        st.session_state.westell_sort_idx = {}
+        st.session_state.westell_search_cols = {}
 
     if st.session_state.df.empty:
         st.info("Upload PDF(s) or ZIP to start extraction.")
@@ -181,7 +171,8 @@ def main():
 
     st.success("✅ Extraction complete!")
 
-    df_view = st.session_state.df_display.copy()
+    # st.session_state.df is never modified; only the Select mask is kept per row
+    df = st.session_state.df
 
     # -----------------------------
     # Sidebar Controls
@@ -191,37 +182,53 @@ def main():
     # 1. Keep/Delete columns
     keep_cols = st.sidebar.multiselect(
         "Column Remove / Reorder",
-        options=[c for c in df_view.columns if c != "Select"],
-        default=[c for c in df_view.columns if c != "Select"]
+        options=list(df.columns),
+        default=list(df.columns)
     )
 
     if not keep_cols:
         st.warning("⚠️ Please select at least one column to view or refresh & upload again to see all columns.")
         return
 
-    df_view = df_view[["Select"] + keep_cols]
+    df_view = df.assign(Select=st.session_state.westell_selected)[["Select"] + keep_cols]
 
     # 2. Sort
     sort_col = st.sidebar.selectbox("Sort by column", options=keep_cols)
     sort_order = st.sidebar.radio("Order", ["Ascending", "Descending"], horizontal=True)
-    df_view = df_view.sort_values(
-        by=sort_col,
-        ascending=(sort_order == "Ascending"),
-        ignore_index=True
-    )
+    # row order per (column, ascending), computed once per extracted frame
+    sort_key = (sort_col, sort_order == "Ascending")
+    order = st.session_state.westell_sort_idx.get(sort_key)
+    if order is None:
+        order = df.sort_values(by=sort_col, ascending=sort_key[1], kind="stable").index.to_numpy()
+        st.session_state.westell_sort_idx[sort_key] = order
+    df_view = df_view.iloc[order]
 
     # 3. Search
     search_text = st.sidebar.text_input("🔍 Search to filter row ")
     if search_text:
-        df_view = df_view[df_view.apply(
-            lambda row: row.astype(str).str.contains(search_text, case=False).any(),
-            axis=1
-        )]
+        # lower-cased string form of each column, built once per extracted frame
+        search_cols = st.session_state.westell_search_cols
+        for c in keep_cols:
+            if c not in search_cols:
+                search_cols[c] = np.asarray(df[c].astype(str).str.lower().fillna(""), dtype=str)
+        needle = search_text.lower()
+        hits = [np.char.find(search_cols[c], needle) >= 0 for c in keep_cols]
+        # the Select column shows as "True" / "False"
+        hits.append(np.where(st.session_state.westell_selected, needle in "true", needle in "false"))
+        row_hit = np.logical_or.reduce(hits)
+        df_view = df_view[row_hit[df_view.index.to_numpy()]]
 
     # -----------------------------
     # Editable table
     # -----------------------------
     st.subheader("Select Rows to Download")
+    # The editor replays its edits by row position, so give each view (upload,
+    # columns, sort, search) its own widget; edits never outlive the view they
+    # were made in, and the Select mask carries the state across views.
+    view_key = hashlib.blake2b(
+        repr((st.session_state.westell_upload_key, keep_cols, sort_key, search_text)).encode(),
+        digest_size=8,
+    ).hexdigest()
     edited_df = st.data_editor(
         df_view,
         column_config={
@@ -232,20 +239,35 @@ def main():
             )
         },
         hide_index=True,
-        key="data_editor",
+        key=f"data_editor_{view_key}",
         width="stretch"   # ✅ replaces use_container_width=True
     )
 
-    st.session_state.df_display = edited_df
+    # df_view keeps the row labels of df (0..n-1), so edits map straight back
+    st.session_state.westell_selected[edited_df.index.to_numpy()] = edited_df["Select"].to_numpy(dtype=bool)
 
     # -----------------------------
     # Download selected rows as CSV
     # -----------------------------
-    selected_df = st.session_state.df_display[st.session_state.df_display["Select"]]
-
-    if not selected_df.empty:
-        download_df = selected_df.drop(columns=["Select"])
-        file_data = download_df.to_csv(index=False).encode("utf-8")
+    view = edited_df
+    selected = view["Select"].to_numpy(dtype=bool)
+
+    if selected.any():
+        # one positional take of the selected rows, without the Select column
+        download_df = view.iloc[selected, view.columns != "Select"]
+        # re-encode only when the downloaded rows/columns/cells actually change
+        csv_key = (
+            tuple(download_df.columns),
+            hashlib.blake2b(
+                pd.util.hash_pandas_object(download_df, index=False).to_numpy().tobytes(),
+                digest_size=16,
+            ).digest(),
+        )
+        cached = st.session_state.get("westell_csv")
+        if cached is None or cached[0] != csv_key:
+            cached = (csv_key, dataframe_to_csv_bytes(download_df))
+            st.session_state.westell_csv = cached
+        file_data = cached[1]
         st.download_button(
             label="⬇️ Download Selected Rows as CSV",
             data=file_data,
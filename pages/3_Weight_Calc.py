@@ -1,7 +1,9 @@
 import os
 import streamlit as st # type: ignore
-from helpers.weight_calc import process_step_file, MATERIAL_DENSITIES
+from helpers.weight_calc import iter_step_results, step_metrics_frame, MATERIAL_DENSITIES, STEP_MEASURED_COLUMNS
+from helpers.ui_components import dataframe_to_csv_bytes
 import pandas as pd
+import numpy as np
 import tempfile
 import os
 
@@ -84,25 +86,32 @@ if uploaded_files:
                         f.write(config['file'].getbuffer())
                     temp_paths.append(temp_path)
                 
-                # Process files with individual densities
-                results = []
+                # Process files with individual densities (in parallel)
+                values = np.empty((len(temp_paths), len(STEP_MEASURED_COLUMNS)))
+                ok = np.zeros(len(temp_paths), dtype=bool)
                 progress_bar = st.progress(0)
                 status_text = st.empty()
                 
-                for idx, (temp_path, config) in enumerate(zip(temp_paths, file_configs)):
-                    status_text.text(f"Processing file {idx + 1}/{len(temp_paths)}: {config['file'].name}")
-                    df = process_step_file(temp_path, config['density'])
-                    if df is not None:
-                        df.insert(0, 'filename', config['file'].name)
-                        df['material'] = config['material'] if config['material'] != 'custom' else 'custom'
-                        results.append(df)
-                    progress_bar.progress((idx + 1) / len(temp_paths))
+                jobs = [(temp_path, config['density']) for temp_path, config in zip(temp_paths, file_configs)]
+                for done, (idx, metrics, error) in enumerate(iter_step_results(jobs), 1):
+                    config = file_configs[idx]
+                    status_text.text(f"Processed file {done}/{len(temp_paths)}: {config['file'].name}")
+                    if error is not None:
+                        st.error(f"Error processing file: {error}")
+                    else:
+                        values[idx] = metrics
+                        ok[idx] = True
+                    progress_bar.progress(done / len(temp_paths))
                 
                 status_text.empty()
                 progress_bar.empty()
                 
-                if results:
-                    results_df = pd.concat(results, ignore_index=True)
+                if ok.any():
+                    # build the table once from the filled rows
+                    done_configs = [config for config, good in zip(file_configs, ok) if good]
+                    results_df = step_metrics_frame(values[ok])
+                    results_df.insert(0, 'filename', [config['file'].name for config in done_configs])
+                    results_df['material'] = [config['material'] for config in done_configs]
                     
                     st.success("✅ Processing complete!")
                     
@@ -129,7 +138,7 @@ if uploaded_files:
                     #    st.metric("Avg Max Value", f"{results_df['max_internal_or_weight'].mean():.4f}")
                     
                     # Download button
-                    csv = results_df.to_csv(index=False)
+                    csv = dataframe_to_csv_bytes(results_df)
                     st.download_button(
                         label="📥 Download Results as CSV",
                         data=csv,
@@ -4,7 +4,7 @@ import os
 from dotenv import load_dotenv
 
 # Import custom modules
-from helpers.config import APP_TITLE, APP_ICON, PAGE_LAYOUT, SIDEBAR_STATE
+from helpers.config import APP_TITLE, APP_ICON, PAGE_LAYOUT, SIDEBAR_STATE, CHAT_HISTORY_LIMIT
 from helpers.agent import AutoGenChatSystem
 from helpers.ui_components import (
     apply_custom_css, render_header, render_openai_config, 
@@ -62,7 +62,11 @@ def render_main_chat():
     chat_container = st.container()
     
     with chat_container:
-        for message in st.session_state.messages:
+        # Only draw the tail of the conversation; older messages stay in session state
+        hidden = len(st.session_state.messages) - CHAT_HISTORY_LIMIT
+        if hidden > 0:
+            st.caption(f"{hidden} earlier message(s) not shown")
+        for message in st.session_state.messages[-CHAT_HISTORY_LIMIT:]:
             render_chat_message(message)
     
     # Chat input
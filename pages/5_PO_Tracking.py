@@ -1,11 +1,8 @@
 import streamlit as st
-import tempfile
-import zipfile
 import os
 import pandas as pd
 from datetime import datetime
-from pathlib import Path
-from helpers.extractor import extract_po_info_ILM, extract_item_blocks_ILM, extract_po_info_Westl
+from helpers.extractor import extract_po_batch, extract_westl_batch, read_pdf_uploads
 
 st.set_page_config(page_title="PO Tracking", layout="wide")
 
@@ -85,32 +82,14 @@ st.markdown(
 
 
 def process_files_for_tracking(uploaded_files, parser_type):
-    temp_dir = Path(tempfile.mkdtemp())
-    pdf_dir = temp_dir / "pdf_folder"
-    pdf_dir.mkdir(exist_ok=True)
-
-    for uploaded_file in uploaded_files:
-        file_path = pdf_dir / uploaded_file.name
-        with open(file_path, "wb") as f:
-            f.write(uploaded_file.getbuffer())
-        if uploaded_file.name.lower().endswith(".zip"):
-            with zipfile.ZipFile(file_path, "r") as zip_ref:
-                zip_ref.extractall(pdf_dir)
-            file_path.unlink()
-
-    pdf_files = [
-        os.path.join(root, f)
-        for root, _, files_in_dir in os.walk(pdf_dir)
-        for f in files_in_dir
-        if f.lower().endswith(".pdf") and not f.startswith("._") and "__MACOSX" not in root
-    ]
+    # (file name, PDF bytes) for every uploaded PDF, each read once
+    pdfs = read_pdf_uploads(uploaded_files)
 
     all_data = []
 
     if parser_type == "ILM":
-        for pdf_file in pdf_files:
-            po_info = extract_po_info_ILM(pdf_file)
-            item_blocks = extract_item_blocks_ILM(pdf_file)
+        # PDFs are parsed in parallel worker processes
+        for po_info, item_blocks in extract_po_batch(pdfs):
             if isinstance(item_blocks, dict) and "error" in item_blocks:
                 continue
             if not isinstance(item_blocks, list):
@@ -126,16 +105,19 @@ def process_files_for_tracking(uploaded_files, parser_type):
                     "Description": block.get("Description", ""),
                 })
     else:  # Westell
-        for pdf_file in pdf_files:
-            rows = extract_po_info_Westl(pdf_file)
-            for row in rows:
-                all_data.append({
-                    "Document Number": row[0],
-                    "Item_Code": row[2],
-                    "PO_issue Date": row[3],
-                    "Delivery Date": row[4],
-                    "Description": row[1],
-                })
+        # PDFs are parsed in parallel worker processes; results come back as columns
+        columns = extract_westl_batch(pdfs)
+        for doc_num, desc, item_code, issue_date, delivery_date in zip(
+            columns["Document Number"], columns["Part/Description"], columns["Item_Code"],
+            columns["PO_issue Date"], columns["Delivery Date"],
+        ):
+            all_data.append({
+                "Document Number": doc_num,
+                "Item_Code": item_code,
+                "PO_issue Date": issue_date,
+                "Delivery Date": delivery_date,
+                "Description": desc,
+            })
 
     if not all_data:
         return pd.DataFrame()
@@ -0,0 +1,49 @@
+import re
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from helpers.agent import CONTEXT_SAMPLE_MIN_UNIQUE, CONTEXT_SAMPLE_ROWS, DataAnalysisAgent, build_data_profile
+
+
+class GenerateDataContextTest(unittest.TestCase):
+    def test_sampled_top_value_counts_are_scaled_to_full_column(self):
+        n = CONTEXT_SAMPLE_ROWS * 4
+        rng = np.random.default_rng(0)
+        # "a" is half of the column, "b" a quarter, the rest are all distinct ids
+        values = rng.choice(["a", "b", "id"], size=n, p=[0.5, 0.25, 0.25]).astype(object)
+        ids = np.flatnonzero(values == "id")
+        values[ids] = [f"id{i}" for i in ids]
+        self.assertGreater(pd.Series(values[:CONTEXT_SAMPLE_ROWS]).nunique(), CONTEXT_SAMPLE_MIN_UNIQUE)
+        df = pd.DataFrame({"kind": pd.Series(values, dtype=object)})
+
+        agent = DataAnalysisAgent("analyst", "role", "prompt")
+        context = agent._generate_data_context(df, build_data_profile(df))
+
+        true_counts = df["kind"].value_counts()
+        for value in ("a", "b"):
+            # dict repr shows either 123 or np.int64(123)
+            reported = int(re.search(rf"'{value}': (?:np\.int64\()?(\d+)", context).group(1))
+            self.assertAlmostEqual(reported, true_counts[value], delta=true_counts[value] * 0.02)
+
+    def test_large_low_cardinality_counts_are_exact(self):
+        n = CONTEXT_SAMPLE_ROWS * 4
+        rng = np.random.default_rng(1)
+        values = rng.choice(["open", "shipped", "billed", "closed", "void"], size=n)
+        df = pd.DataFrame({"status": pd.Series(values, dtype=object)})
+
+        agent = DataAnalysisAgent("analyst", "role", "prompt")
+        context = agent._generate_data_context(df, build_data_profile(df))
+
+        self.assertIn(f"status top values: {dict(df['status'].value_counts().head(3))}", context)
+
+    def test_small_frame_counts_are_exact(self):
+        df = pd.DataFrame({"kind": pd.Series(["x", "x", "y"], dtype=object)})
+        agent = DataAnalysisAgent("analyst", "role", "prompt")
+        context = agent._generate_data_context(df, build_data_profile(df))
+        self.assertIn(f"kind top values: {dict(df['kind'].value_counts().head(3))}", context)
+
+
+if __name__ == "__main__":
+    unittest.main()